@@ -17,20 +17,23 @@ from src.config.logger_config import setup_logging
 
 setup_logging()
 
+import asyncio
 import logging
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from os import getenv
 
+from anyio import to_thread
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 
 from src.audios.audio_controller import router as audio_router
 from src.auth import firebase_client_service
 from src.brand_guidelines.brand_guideline_controller import (
     router as brand_guideline_router,
 )
+from src.config.config_service import config_service
 from src.galleries.gallery_controller import router as gallery_router
 from src.generation_options.generation_options_controller import (
     router as generation_options_router,
@@ -45,6 +48,7 @@ from src.source_assets.source_asset_controller import (
 )
 from src.users.user_controller import router as user_router
 from src.videos.veo_controller import router as video_router
+from src.videos.veo_service import VeoService
 from src.workspaces.workspace_controller import router as workspace_router
 
 # Get a logger instance for use in this file. It will inherit the root setup.
@@ -76,6 +80,9 @@ def configure_cors(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Let browsers cache preflight responses (24h, capped lower by some
+        # browsers) instead of sending an OPTIONS before every API call.
+        max_age=86400,
     )
 
 
@@ -86,17 +93,35 @@ async def lifespan(app: FastAPI):
 
     # Startup logic
     logger.info(
-        f"""Firebase App Name (if initialized): {
-          firebase_client_service.firebase_admin.get_app().name
-          if firebase_client_service.firebase_admin._apps
-          else 'Not Initialized'
-        }"""
+        "Firebase App Name (if initialized): %s",
+        (
+            firebase_client_service.firebase_admin.get_app().name
+            if firebase_client_service.firebase_admin._apps
+            else "Not Initialized"
+        ),
+    )
+
+    # Blocking SDK calls are offloaded to threads: sync endpoints run on
+    # AnyIO's worker threads and `asyncio.to_thread` uses the loop's default
+    # executor. Those threads only wait on network I/O (Firestore, GCS, GenAI),
+    # so size both pools above their defaults to avoid queueing requests
+    # behind slow upstream calls.
+    thread_pool_size = config_service.THREADPOOL_MAX_WORKERS
+    to_thread.current_default_thread_limiter().total_tokens = thread_pool_size
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=thread_pool_size)
     )
 
     logger.info("Creating ProcessPoolExecutor...")
+    # The process pool is reserved for the long-running video jobs (polling,
+    # ffmpeg thumbnails and concatenation), which must not share the workers.
     # Create the pool and attach it to the app's state
     app.state.process_pool = ProcessPoolExecutor(max_workers=4)
 
+    # The video service holds no per-request state, so build it (and the
+    # IAM, GCS, Gemini and Firestore clients behind it) once for the app.
+    app.state.veo_service = VeoService()
+
     # Ensure the default public workspace exists on startup.
     firebase_client_service.firebase_client._ensure_default_workspace_exists()
 
@@ -110,15 +135,6 @@ async def lifespan(app: FastAPI):
     # Your shutdown logic here, e.g., closing database connections
 
 
-app = FastAPI(
-    lifespan=lifespan,
-    title="Creative Studio API",
-    description="""GenMedia Creative Studio is an app that highlights the capabilities
-    of Google Cloud Vertex AI generative AI creative APIs, including Imagen, Veo, Lyria, Chirp and more! 🚀""",
-)
-
-
-@app.exception_handler(Exception)
 async def generic_exception_handler(request: Request, exc: Exception):
     """
     This is the global 'catch-all' exception handler.
@@ -126,37 +142,86 @@ async def generic_exception_handler(request: Request, exc: Exception):
     """
     # Log the full error for debugging purposes
     logger.error(
-        f"Unhandled exception for request {request.method} {request.url}: {exc}",
+        "Unhandled exception for request %s %s: %s",
+        request.method,
+        request.url,
+        exc,
         exc_info=True,
     )
 
     # Return a standardized 500 Internal Server Error response
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "An internal server error occurred."},
     )
 
 
-@app.get("/", tags=["Health Check"])
 async def root():
     return "You are calling Creative Studio Backend"
 
 
-@app.get("/api/version", tags=["Health Check"])
-def version():
-    return "v0.0.1"
+# Built once: returning a ready Response skips validation and encoding, and an
+# async handler avoids a threadpool hop for a constant.
+_VERSION_RESPONSE = PlainTextResponse("v0.0.1")
+
+
+async def version():
+    return _VERSION_RESPONSE
+
+
+ROUTERS = (
+    imagen_router,
+    audio_router,
+    video_router,
+    gallery_router,
+    gemini_router,
+    user_router,
+    generation_options_router,
+    media_template_router,
+    source_asset_router,
+    workspace_router,
+    brand_guideline_router,
+)
+
+
+def create_app() -> FastAPI:
+    """
+    Builds the FastAPI application: middleware, exception handlers, health
+    checks and all feature routers are registered once, before it serves.
+    """
+    app = FastAPI(
+        lifespan=lifespan,
+        # Serialize every response with orjson instead of the stdlib encoder.
+        default_response_class=ORJSONResponse,
+        title="Creative Studio API",
+        description="""GenMedia Creative Studio is an app that highlights the capabilities
+    of Google Cloud Vertex AI generative AI creative APIs, including Imagen, Veo, Lyria, Chirp and more! 🚀""",
+    )
+
+    app.add_exception_handler(Exception, generic_exception_handler)
+
+    # Health checks return plain text, skipping the JSON encoder.
+    app.add_api_route(
+        "/",
+        root,
+        methods=["GET"],
+        tags=["Health Check"],
+        response_class=PlainTextResponse,
+    )
+    app.add_api_route(
+        "/api/version",
+        version,
+        methods=["GET"],
+        tags=["Health Check"],
+        response_class=PlainTextResponse,
+    )
+
+    configure_cors(app)
+
+    for router in ROUTERS:
+        app.include_router(router)
 
+    return app
 
-configure_cors(app)
 
-app.include_router(imagen_router)
-app.include_router(audio_router)
-app.include_router(video_router)
-app.include_router(gallery_router)
-app.include_router(gemini_router)
-app.include_router(user_router)
-app.include_router(generation_options_router)
-app.include_router(media_template_router)
-app.include_router(source_asset_router)
-app.include_router(workspace_router)
-app.include_router(brand_guideline_router)
+app = create_app()
@@ -14,10 +14,8 @@
 
 
 import logging
-from fastapi import APIRouter
-from fastapi import File, UploadFile
+from fastapi import APIRouter, Depends, File, UploadFile
 from google.cloud import speech
-from fastapi import APIRouter, Depends
 
 from src.users.user_model import UserRoleEnum
 from src.auth.auth_guard import RoleChecker
@@ -1,5 +1,9 @@
+import hashlib
 import logging
-from typing import List
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -20,10 +24,55 @@ user_service = UserService()
 # It tells FastAPI how to find the token but doesn't validate it itself.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Transport used to fetch Google's token-signing certs. It's shared so every
+# verification reuses the same HTTP session and its keep-alive connections.
+_google_request = google_auth_requests.Request()
+
+# Recently authenticated users, keyed by a SHA-256 digest of their ID token so
+# raw bearer tokens aren't kept in memory. The frontend sends the same token on
+# every call until it expires, so this skips the signature check and the
+# Firestore lookup for all but the first request.
+_user_cache: OrderedDict[bytes, Tuple[float, UserModel]] = OrderedDict()
+_user_cache_lock = threading.Lock()
+
 
 logger = logging.getLogger(__name__)
 
 
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def _get_cached_user(token: str) -> Optional[UserModel]:
+    key = _token_key(token)
+    with _user_cache_lock:
+        entry = _user_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.time():
+            del _user_cache[key]
+            return None
+        _user_cache.move_to_end(key)
+        return user
+
+
+def _cache_user(token: str, token_expiry: float, user: UserModel) -> None:
+    """Caches `user` until the TTL elapses or the token expires, whichever is first."""
+    max_entries = config_service.AUTH_USER_CACHE_MAX_ENTRIES
+    if max_entries <= 0:
+        return
+    expires_at = min(
+        time.time() + config_service.AUTH_USER_CACHE_TTL_SECONDS, token_expiry
+    )
+    key = _token_key(token)
+    with _user_cache_lock:
+        _user_cache[key] = (expires_at, user)
+        _user_cache.move_to_end(key)
+        while len(_user_cache) > max_entries:
+            _user_cache.popitem(last=False)
+
+
 def get_current_user(token: str = Depends(oauth2_scheme)) -> UserModel:
     """
     Dependency that handles the entire authentication and user provisioning flow.
@@ -33,7 +82,13 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> UserModel:
     3. Checks if a user document exists in Firestore.
     4. If the user is new, creates their document ("Just-In-Time Provisioning").
     5. Returns a Pydantic model with the user's data.
+
+    The result is cached briefly per token, so repeat calls skip steps 1-4.
     """
+    cached_user = _get_cached_user(token)
+    if cached_user is not None:
+        return cached_user
+
     try:
         # Verify the Google-issued OIDC ID token from the Authorization header.
         # The audience (aud) must be the OAuth 2.0 client ID of the Identity Platform-protected resource.
@@ -41,7 +96,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> UserModel:
         GOOGLE_TOKEN_AUDIENCE = config_service.GOOGLE_TOKEN_AUDIENCE
         decoded_token = id_token.verify_oauth2_token(
             token,
-            google_auth_requests.Request(),  # Use google.auth.transport.requests for fetching public keys
+            _google_request,  # Use google.auth.transport.requests for fetching public keys
             audience=GOOGLE_TOKEN_AUDIENCE,
         )
 
@@ -80,6 +135,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> UserModel:
                 detail="Could not create or retrieve user profile.",
             )
 
+        _cache_user(token, decoded_token.get("exp", 0), user_doc)
         return user_doc
 
     except auth.ExpiredIdTokenError:
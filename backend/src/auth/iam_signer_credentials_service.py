@@ -14,7 +14,10 @@
 
 import datetime
 import logging
+import os
 from os import getenv
+from typing import Optional
+
 from google.auth import credentials
 from google.cloud import iam_credentials_v1
 from google.cloud import storage
@@ -30,12 +33,36 @@ class IamSignerCredentials(credentials.Signing):
     needs a signature.
     """
 
+    # Clients are shared across instances; the service itself is built per request.
+    _iam_client: Optional[iam_credentials_v1.IAMCredentialsClient] = None
+    _storage_client: Optional[storage.Client] = None
+
     def __init__(self):
         # 1. Create the custom credentials object for signing.
         self.service_account_email = getenv("SIGNING_SA_EMAIL", "")
-        self.iam_client = iam_credentials_v1.IAMCredentialsClient()
+        self.iam_client = self.get_iam_client()
         self._sa_path = f"projects/-/serviceAccounts/{self.service_account_email}"
 
+    @classmethod
+    def get_iam_client(cls) -> iam_credentials_v1.IAMCredentialsClient:
+        """Returns the shared IAM Credentials client, creating it on first use."""
+        if cls._iam_client is None:
+            cls._iam_client = iam_credentials_v1.IAMCredentialsClient()
+        return cls._iam_client
+
+    @property
+    def storage_client(self) -> storage.Client:
+        """Returns the shared Storage client used to build the signed URLs."""
+        cls = type(self)
+        if cls._storage_client is None:
+            cls._storage_client = storage.Client()
+        return cls._storage_client
+
+    @classmethod
+    def _reset_clients(cls) -> None:
+        cls._iam_client = None
+        cls._storage_client = None
+
     def generate_presigned_url(self, gcs_uri: str | None, expiration_hours: int = 1) -> str:
         """Generates a v4 presigned URL for a GCS object.
 
@@ -60,9 +87,8 @@ class IamSignerCredentials(credentials.Signing):
 
         try:
             # 2. Parse the GCS URI and create a blob object.
-            storage_client = storage.Client()
-            bucket_name, blob_name = gcs_uri.replace("gs://", "").split("/", 1)
-            bucket = storage_client.bucket(bucket_name)
+            bucket_name, blob_name = gcs_uri.removeprefix("gs://").split("/", 1)
+            bucket = self.storage_client.bucket(bucket_name)
             blob = bucket.blob(blob_name)
 
             # 3. Generate the signed URL, passing the custom credentials.
@@ -110,3 +136,8 @@ class IamSignerCredentials(credentials.Signing):
     def refresh(self, request):
         """Refresh is not used by this credentials type."""
         pass
+
+
+# A forked child (e.g. the video process pool) must not reuse the parent's
+# gRPC channel and HTTP connections, so it builds its own clients on first use.
+os.register_at_fork(after_in_child=IamSignerCredentials._reset_clients)
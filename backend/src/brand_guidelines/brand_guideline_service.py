@@ -1,10 +1,11 @@
 import asyncio
 import datetime
+import hashlib
 import io
 import logging
 import math
 import uuid
-from typing import List, Optional
+from typing import Optional
 
 from fastapi import HTTPException, UploadFile, status
 from google.cloud.firestore_v1.base_query import FieldFilter
@@ -24,6 +25,7 @@ from src.brand_guidelines.schema.brand_guideline_model import (
     BrandGuidelineModel,
 )
 from src.common.storage_service import GcsService
+from src.multimodal.gemini_cache import gemini_cache
 from src.multimodal.gemini_service import GeminiService
 from src.users.user_model import UserModel, UserRoleEnum
 from src.workspaces.repository.workspace_repository import WorkspaceRepository
@@ -148,6 +150,30 @@ class BrandGuidelineService:
             **guideline.model_dump(), presigned_source_pdf_urls=presigned_urls
         )
 
+    async def _extract_brand_info(
+        self, gcs_uris: list[str]
+    ) -> Optional[BrandGuidelineModel]:
+        """
+        Extracts brand info from each PDF chunk with Gemini and aggregates the
+        partial results into a single model.
+        """
+        # Use asyncio.to_thread to run the synchronous SDK calls concurrently
+        extraction_tasks = [
+            asyncio.to_thread(
+                self.gemini_service.extract_brand_info_from_pdf, uri
+            )
+            for uri in gcs_uris
+        ]
+        partial_results = await asyncio.gather(*extraction_tasks)
+        # Filter out any failed extractions (which return empty dicts)
+        successful_partial_results = [r for r in partial_results if r]
+
+        # The aggregation is another blocking Gemini call, so keep it off the
+        # event loop as well.
+        return await asyncio.to_thread(
+            self.gemini_service.aggregate_brand_info, successful_partial_results
+        )
+
     async def create_and_process_guideline(
         self,
         name: str,
@@ -212,21 +238,24 @@ class BrandGuidelineService:
 
         logger.info(f"PDF(s) uploaded to {gcs_uris}. Starting AI extraction.")
 
-        # 2. Call Gemini for each chunk to extract structured data
-        # Use asyncio.to_thread to run the synchronous SDK calls concurrently
-        extraction_tasks = [
-            asyncio.to_thread(
-                self.gemini_service.extract_brand_info_from_pdf, uri
-            )
-            for uri in gcs_uris
-        ]
-        partial_results = await asyncio.gather(*extraction_tasks)
-        # Filter out any failed extractions (which return empty dicts)
-        successful_partial_results = [r for r in partial_results if r]
+        # 2. Extract and aggregate the brand info with Gemini. Re-uploading the
+        # same PDF (e.g. to replace a workspace's guideline) reuses the earlier
+        # analysis instead of re-running every Gemini call.
+        cache_key = gemini_cache.make_key(
+            "brand_pdf",
+            self.gemini_service.cfg.GEMINI_MODEL_ID,
+            hashlib.sha256(file_contents).hexdigest(),
+        )
+
+        async def fetch() -> str:
+            extracted = await self._extract_brand_info(gcs_uris)
+            return extracted.model_dump_json() if extracted else ""
 
-        # 3. Aggregate the results
+        extracted_json = await gemini_cache.aget_or_compute(cache_key, fetch)
         extracted_data: BrandGuidelineModel | None = (
-            self.gemini_service.aggregate_brand_info(successful_partial_results)
+            BrandGuidelineModel.model_validate_json(extracted_json)
+            if extracted_json
+            else None
         )
 
         if not extracted_data:
@@ -1,6 +1,6 @@
 from typing import Generic, List, Optional, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
 from src.common.base_dto import BaseDto
 
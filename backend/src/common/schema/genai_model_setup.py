@@ -15,7 +15,6 @@
 
 import logging
 from typing import Optional
-import google.auth
 from google.genai import Client
 from src.config.config_service import config_service
 
@@ -29,16 +29,30 @@ logger = logging.getLogger(__name__)
 class GcsService:
     """A service for interacting with Google Cloud Storage."""
 
+    # Shared Storage client, so per-request services don't rediscover credentials.
+    _client: Optional[storage.Client] = None
+
     def __init__(self, bucket_name: Optional[str] = None):
         """Initializes the GCS client and bucket."""
         self.cfg = config_service
-        self.client = storage.Client(project=self.cfg.PROJECT_ID)
+        self.client = self.get_client()
         self.bucket_name = bucket_name or self.cfg.GENMEDIA_BUCKET
         self.bucket = self.client.bucket(self.bucket_name)
         logger.info(
             f"GcsService initialized for bucket: gs://{self.bucket_name}"
         )
 
+    @classmethod
+    def get_client(cls) -> storage.Client:
+        """Returns the shared Storage client, creating it on first use."""
+        if cls._client is None:
+            cls._client = storage.Client(project=config_service.PROJECT_ID)
+        return cls._client
+
+    @classmethod
+    def _reset_client(cls) -> None:
+        cls._client = None
+
     def download_from_gcs(
         self, gcs_uri_path: str, destination_file_path: str
     ) -> str | None:
@@ -136,7 +150,7 @@ class GcsService:
             )
             return False
 
-        blob_name = gcs_uri.replace(f"gs://{self.bucket_name}/", "")
+        blob_name = gcs_uri.removeprefix(f"gs://{self.bucket_name}/")
         blob = self.bucket.blob(blob_name)
         try:
             blob.delete()
@@ -189,3 +203,8 @@ class GcsService:
                 f"Failed to download '{destination_blob_name}' from GCS: {e}"
             )
             return None
+
+
+# A forked child (e.g. the video process pool) must not reuse the parent's
+# pooled HTTP connections, so it builds its own client on first use.
+os.register_at_fork(after_in_child=GcsService._reset_client)
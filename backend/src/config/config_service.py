@@ -30,11 +30,20 @@ class ConfigService(BaseSettings):
     LOG_LEVEL: str = "INFO"
     INIT_VERTEX: bool = True
 
+    # --- Server ---
+    # Number of worker threads for blocking I/O offloads (sync endpoints and
+    # `asyncio.to_thread` calls).
+    THREADPOOL_MAX_WORKERS: int = 100
+
     # --- Google Identity ---
     GOOGLE_TOKEN_AUDIENCE: str = ""
     ALLOWED_ORGS_STR: str = Field(
         default="", alias="IDENTITY_PLATFORM_ALLOWED_ORGS"
     )
+    # How long a verified token and its provisioned user are reused before
+    # the token is checked and the user is read from Firestore again.
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 1024
 
     # --- Storage ---
     # The defaults will be set in the validator below to prevent recursion.
@@ -43,6 +52,18 @@ class ConfigService(BaseSettings):
     # --- Gemini ---
     GEMINI_MODEL_ID: str = "gemini-2.5-pro"
     GEMINI_AUDIO_ANALYSIS_MODEL_ID: str = "gemini-2.5-pro"
+    # In-process cache for repeated, deterministic prompt rewrites.
+    GEMINI_CACHE_MAX_ENTRIES: int = 1024
+    GEMINI_CACHE_TTL_SECONDS: int = 3600
+    # Cap on Gemini text requests, so bursts queue locally instead of tripping
+    # the project quota. The limit applies PER PROCESS: each gunicorn worker
+    # (WEB_CONCURRENCY, 4 in the image) and each of its 4 video pool processes
+    # has its own bucket, so one container can reach this rate times
+    # WEB_CONCURRENCY * 5 (20 req/s, 1200 RPM, with the defaults). To stay under
+    # a project-wide quota of Q req/s, set it to about
+    # Q / (WEB_CONCURRENCY * 5 * max_instances). 0 disables the limit.
+    GEMINI_MAX_REQUESTS_PER_SECOND: float = 1
+    GEMINI_RATE_LIMIT_BURST: int = 5
 
     # --- Collections ---
     FIREBASE_DB: str = "(default)"
@@ -12,12 +12,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
 import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from os import getenv
 import sys
 from google.cloud.logging import Client as LoggerClient
 from google.cloud.logging.handlers import CloudLoggingHandler
 
+
+def _add_queued_handler(root_logger: logging.Logger, handler: logging.Handler):
+    """
+    Attaches `handler` to the root logger through a queue, so request threads
+    only enqueue records and a single listener thread does the formatting and
+    the blocking writes.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    root_logger.addHandler(queue_handler)
+
+    def _use_handler_directly():
+        # The listener thread doesn't survive a fork (e.g. the video process
+        # pool), so forked children write through the handler directly.
+        root_logger.removeHandler(queue_handler)
+        root_logger.addHandler(handler)
+
+    os.register_at_fork(after_in_child=_use_handler_directly)
+
+
 def setup_logging():
     """
     Configures the root logger for the entire application.
@@ -38,7 +65,8 @@ def setup_logging():
 
     if getenv("ENVIRONMENT") == "production":
         # In PRODUCTION, attach the Google Cloud Logging handler.
-        # This sends logs as structured JSON to Google Cloud.
+        # This sends logs as structured JSON to Google Cloud, batching them on
+        # its own background thread.
         client = LoggerClient()
         handler = CloudLoggingHandler(client, name="creative-studio-main")
         root_logger.addHandler(handler)
@@ -49,4 +77,4 @@ def setup_logging():
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
         handler.setFormatter(formatter)
-        root_logger.addHandler(handler)
+        _add_queued_handler(root_logger, handler)
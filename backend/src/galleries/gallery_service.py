@@ -22,7 +22,6 @@ from google.cloud.firestore_v1.base_query import FieldFilter
 from src.auth.iam_signer_credentials_service import IamSignerCredentials
 from src.common.dto.pagination_response_dto import PaginationResponseDto
 from src.common.schema.media_item_model import (
-    AssetRoleEnum,
     JobStatusEnum,
     MediaItemModel,
     SourceAssetLink,
@@ -40,7 +39,6 @@ from src.source_assets.repository.source_asset_repository import (
 )
 from src.users.user_model import UserModel, UserRoleEnum
 from src.workspaces.repository.workspace_repository import WorkspaceRepository
-from src.workspaces.schema.workspace_model import WorkspaceScopeEnum
 from src.workspaces.workspace_auth_guard import workspace_auth_service
 
 logger = logging.getLogger(__name__)
@@ -214,9 +212,11 @@ class GalleryService:
             asset for asset in enriched_source_media_items_with_nones if asset
         ]
 
-        # Create the response DTO, copying all original data and adding the new URLs
+        # Create the response DTO, copying all original data and adding the new URLs.
+        # The field values of the already validated item are reused directly
+        # instead of serializing it with model_dump() first.
         return MediaItemResponse(
-            **item.model_dump(exclude={"source_assets"}),
+            **{**item.__dict__, "source_assets": None},
             presigned_urls=presigned_urls,
             presigned_thumbnail_urls=presigned_thumbnail_urls,
             enriched_source_assets=enriched_source_assets or None,
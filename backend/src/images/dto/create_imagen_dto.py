@@ -1,7 +1,6 @@
 from typing import Annotated, Literal, Optional
 
 from fastapi import Query
-from google.genai import types
 from pydantic import Field, field_validator, model_validator
 
 from src.common.base_dto import (
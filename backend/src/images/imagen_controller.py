@@ -95,14 +95,14 @@ async def generate_images_vto(
 
 
 @router.post("/recontextualize-product-in-scene")
-def recontextualize_product_in_scene(
+async def recontextualize_product_in_scene(
     image_uris_list: list[str],
     prompt: str,
     sample_count: int,
     service: ImagenService = Depends(),
 ) -> list[str]:
     try:
-        return service.recontextualize_product_in_scene(
+        return await service.recontextualize_product_in_scene(
             image_uris_list, prompt, sample_count
         )
     except Exception as e:
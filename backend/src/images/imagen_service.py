@@ -15,16 +15,13 @@
 
 import asyncio
 import base64
-import io
 import logging
 import os
 import time
 import uuid
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from google.cloud import aiplatform
 from google.genai import Client, types
-from PIL import Image as PILImage
 
 from src.auth.iam_signer_credentials_service import IamSignerCredentials
 from src.common.base_dto import AspectRatioEnum, GenerationModelEnum, MimeTypeEnum
@@ -52,22 +49,32 @@ from src.multimodal.gemini_service import GeminiService, PromptTargetEnum
 from src.source_assets.repository.source_asset_repository import SourceAssetRepository
 from src.users.user_model import UserModel
 
+if TYPE_CHECKING:
+    from google.cloud.aiplatform.gapic import PredictionServiceClient
+
 logger = logging.getLogger(__name__)
 
+# The recontext model's resource name only depends on startup config.
+_RECONTEXT_MODEL_ENDPOINT = (
+    f"projects/{config_service.PROJECT_ID}/locations/{config_service.LOCATION}"
+    f"/publishers/google/models/{config_service.MODEL_IMAGEN_PRODUCT_RECONTEXT}"
+)
+
 
-def gemini_flash_image_preview_generate_image(
+async def gemini_flash_image_preview_generate_image(
     gcs_service: GcsService,
     vertexai_client: Client,
     prompt: str,
     bucket_name: str,
     reference_images: Optional[List[types.Image]] = None,
-) -> types.GeneratedImage | None:
+) -> List[types.GeneratedImage]:
     """
-    Generates an image using the Gemini API for text-to-image or image-to-image.
-    This is a blocking function.
+    Generates images using the Gemini API for text-to-image or image-to-image.
+    Every image part in the response is uploaded to GCS concurrently, off the
+    event loop.
 
     Returns:
-        A types.GeneratedImage object, or None if failed.
+        A list of types.GeneratedImage objects, empty if failed.
     """
     model = GenerationModelEnum.GEMINI_2_5_FLASH_IMAGE_PREVIEW
 
@@ -90,48 +97,59 @@ def gemini_flash_image_preview_generate_image(
     generate_content_config = types.GenerateContentConfig(
         response_modalities=["TEXT", "IMAGE"]
     )
-    stream = vertexai_client.models.generate_content_stream(
+    # A unary call is enough since the whole response is needed before uploading;
+    # streaming would just add per-chunk framing and keep the connection open longer.
+    response = await vertexai_client.aio.models.generate_content(
         model=model,
         contents=contents,
         config=generate_content_config,
     )
 
-    for chunk in stream:
-        if not chunk.candidates:
-            continue
-        for candidate in chunk.candidates:
-            if candidate.content and candidate.content.parts:
-                for part in candidate.content.parts:
-                    if part.inline_data:
-                        # The API returns image data as a base64 encoded string
-                        image_data_base64 = part.inline_data.data or ""
-                        content_type = part.inline_data.mime_type or "image/png"
-
-                        # Upload using our GCS service
-                        image_url = gcs_service.store_to_gcs(
-                            folder="gemini_images",
-                            file_name=str(uuid.uuid4()),
-                            mime_type=content_type,
-                            contents=image_data_base64,
-                            bucket_name=bucket_name,
-                        )
-                        if not image_url:
-                            logging.debug("Error: image url not generated ")
-                            return None
-
-                        # Create a standard types.Image object
-                        image_object = types.Image(
-                            gcs_uri=image_url,
-                            mime_type=content_type,
-                        )
-                        # Wrap it in a types.GeneratedImage and return
-                        return types.GeneratedImage(image=image_object)
+    # google-genai already decodes inline_data into raw image bytes, so they
+    # are uploaded as-is, without another base64 round-trip.
+    images: List[tuple[bytes, str]] = [
+        (part.inline_data.data, part.inline_data.mime_type or "image/png")
+        for candidate in response.candidates or []
+        if candidate.content and candidate.content.parts
+        for part in candidate.content.parts
+        if part.inline_data and part.inline_data.data
+    ]
+    if not images:
+        logger.debug("No image data found in the API response.")
+        return []
+
+    # Upload using our GCS service, one thread per image
+    upload_tasks = [
+        asyncio.to_thread(
+            gcs_service.store_to_gcs,
+            folder="gemini_images",
+            file_name=str(uuid.uuid4()),
+            mime_type=content_type,
+            contents=image_bytes,
+            bucket_name=bucket_name,
+        )
+        for image_bytes, content_type in images
+    ]
+    image_urls = await asyncio.gather(*upload_tasks)
 
-    logging.debug("No image data found in the API response stream.")
-    return None  # Return None if no image was found
+    generated_images: List[types.GeneratedImage] = []
+    for (_, content_type), image_url in zip(images, image_urls):
+        if not image_url:
+            logger.debug("Error: image url not generated ")
+            continue
+        # Wrap a standard types.Image object in a types.GeneratedImage
+        generated_images.append(
+            types.GeneratedImage(
+                image=types.Image(gcs_uri=image_url, mime_type=content_type)
+            )
+        )
+    return generated_images
 
 
 class ImagenService:
+    # Shared across instances; the service itself is built per request.
+    _prediction_client: Optional["PredictionServiceClient"] = None
+
     def __init__(self):
         """Initializes the service with its dependencies."""
         self.iam_signer_credentials = IamSignerCredentials()
@@ -141,6 +159,22 @@ class ImagenService:
         self.source_asset_repo = SourceAssetRepository()
         self.cfg = config_service
 
+    @classmethod
+    def get_prediction_client(cls) -> "PredictionServiceClient":
+        """Returns the shared Vertex AI prediction client, creating it on first use."""
+        if cls._prediction_client is None:
+            # Imported here: the aiplatform SDK is slow to import and only the
+            # recontext endpoint needs it, so workers don't pay for it at boot.
+            from google.cloud.aiplatform.gapic import PredictionServiceClient
+
+            client_options = {
+                "api_endpoint": f"{config_service.LOCATION}-aiplatform.googleapis.com"
+            }
+            cls._prediction_client = PredictionServiceClient(
+                client_options=client_options
+            )
+        return cls._prediction_client
+
     async def generate_images(
         self, request_dto: CreateImagenDto, user: UserModel
     ) -> MediaItemResponse | None:
@@ -153,7 +187,7 @@ class ImagenService:
         gcs_output_directory = f"gs://{self.cfg.GENMEDIA_BUCKET}"
 
         original_prompt = request_dto.prompt
-        rewritten_prompt = self.gemini_service.enhance_prompt_from_dto(
+        rewritten_prompt = await self.gemini_service.aenhance_prompt_from_dto(
             dto=request_dto, target_type=PromptTargetEnum.IMAGE
         )
         request_dto.prompt = rewritten_prompt
@@ -161,48 +195,60 @@ class ImagenService:
         source_assets: List[SourceAssetLink] = []
         reference_images_for_api: List[types.Image] = []
 
-        if request_dto.source_asset_ids:
-            for asset_id in request_dto.source_asset_ids:
-                source_asset = await asyncio.to_thread(
-                    self.source_asset_repo.get_by_id, asset_id
+        # Look up every source asset and parent media item concurrently; the
+        # results keep the request's order.
+        asset_ids = request_dto.source_asset_ids or []
+        media_inputs = request_dto.source_media_items or []
+        lookups = await asyncio.gather(
+            *(
+                asyncio.to_thread(self.source_asset_repo.get_by_id, asset_id)
+                for asset_id in asset_ids
+            ),
+            *(
+                asyncio.to_thread(
+                    self.media_repo.get_by_id, gen_input.media_item_id
                 )
-                if source_asset:
-                    source_assets.append(
-                        SourceAssetLink(
-                            asset_id=asset_id, role=AssetRoleEnum.INPUT
-                        )
-                    )
-                    reference_images_for_api.append(
-                        types.Image(
-                            gcs_uri=source_asset.gcs_uri,
-                            mime_type=source_asset.mime_type,
-                        )
-                    )
-                else:
-                    logger.warning(
-                        f"Source asset with ID {asset_id} not found."
-                    )
+                for gen_input in media_inputs
+            ),
+        )
+        found_assets = lookups[: len(asset_ids)]
+        parent_items = lookups[len(asset_ids) :]
 
-        if request_dto.source_media_items:
-            for gen_input in request_dto.source_media_items:
-                parent_item = await asyncio.to_thread(
-                    self.media_repo.get_by_id, gen_input.media_item_id
+        for asset_id, source_asset in zip(asset_ids, found_assets):
+            if source_asset:
+                source_assets.append(
+                    SourceAssetLink(asset_id=asset_id, role=AssetRoleEnum.INPUT)
                 )
-                if (
-                    parent_item
-                    and parent_item.gcs_uris
-                    and 0 <= gen_input.media_index < len(parent_item.gcs_uris)
-                ):
-                    gcs_uri = parent_item.gcs_uris[gen_input.media_index]
-                    reference_images_for_api.append(
-                        types.Image(
-                            gcs_uri=gcs_uri, mime_type=parent_item.mime_type
-                        )
+                reference_images_for_api.append(
+                    types.Image(
+                        gcs_uri=source_asset.gcs_uri,
+                        mime_type=source_asset.mime_type,
                     )
-                else:
-                    logger.warning(
-                        f"Could not find or use generated_input: {gen_input.media_item_id} at index {gen_input.media_index}"
+                )
+            else:
+                logger.warning(
+                    "Source asset with ID %s not found.",
+                    asset_id,
+                )
+
+        for gen_input, parent_item in zip(media_inputs, parent_items):
+            if (
+                parent_item
+                and parent_item.gcs_uris
+                and 0 <= gen_input.media_index < len(parent_item.gcs_uris)
+            ):
+                gcs_uri = parent_item.gcs_uris[gen_input.media_index]
+                reference_images_for_api.append(
+                    types.Image(
+                        gcs_uri=gcs_uri, mime_type=parent_item.mime_type
                     )
+                )
+            else:
+                logger.warning(
+                    "Could not find or use generated_input: %s at index %s",
+                    gen_input.media_item_id,
+                    gen_input.media_index,
+                )
 
         all_generated_images: List[types.GeneratedImage] = []
 
@@ -215,8 +261,7 @@ class ImagenService:
                 ):
                     # --- GEMINI FLASH TEXT-TO-IMAGE ---
                     tasks = [
-                        asyncio.to_thread(
-                            gemini_flash_image_preview_generate_image,
+                        gemini_flash_image_preview_generate_image(
                             gcs_service=self.gcs_service,
                             vertexai_client=client,
                             prompt=request_dto.prompt,
@@ -226,7 +271,9 @@ class ImagenService:
                     ]
                     gemini_images_response = await asyncio.gather(*tasks)
                     all_generated_images = [
-                        img for img in gemini_images_response if img
+                        img
+                        for images in gemini_images_response
+                        for img in images
                     ]
                 else:
                     # --- OTHER IMAGEN MODELS (TEXT-TO-IMAGE): Single Batch API Call ---
@@ -254,8 +301,7 @@ class ImagenService:
                 ):
                     # --- GEMINI FLASH IMAGE-TO-IMAGE ---
                     tasks = [
-                        asyncio.to_thread(
-                            gemini_flash_image_preview_generate_image,
+                        gemini_flash_image_preview_generate_image(
                             gcs_service=self.gcs_service,
                             vertexai_client=client,
                             prompt=request_dto.prompt,
@@ -266,7 +312,9 @@ class ImagenService:
                     ]
                     gemini_images_response = await asyncio.gather(*tasks)
                     all_generated_images = [
-                        img for img in gemini_images_response if img
+                        img
+                        for images in gemini_images_response
+                        for img in images
                     ]
                 else:
                     # --- IMAGEN MODELS (IMAGE-TO-IMAGE) ---
@@ -292,63 +340,55 @@ class ImagenService:
                 return None
 
             # --- UNIFIED PROCESSING AND SAVING ---
-            # Create the list of permanent GCS URIs and the response for the frontend
-            valid_generated_images = [
-                img
-                for img in all_generated_images
-                if img.image and img.image.gcs_uri
-            ]
-            mime_type: MimeTypeEnum = (
-                MimeTypeEnum.IMAGE_PNG
-                if valid_generated_images[0].image
-                and valid_generated_images[0].image.mime_type
-                == MimeTypeEnum.IMAGE_PNG
-                else MimeTypeEnum.IMAGE_JPEG
-            )
-
-            # 1. Upscale images if needed
-            if request_dto.upscale_factor:
-                upscale_dtos: list[UpscaleImagenDto] = [
-                    UpscaleImagenDto(
-                        generation_model=request_dto.generation_model,
-                        user_image=img.image.gcs_uri or "",
-                        mime_type=(
-                            MimeTypeEnum.IMAGE_PNG
-                            if img.image.mime_type
-                            == MimeTypeEnum.IMAGE_PNG.value
-                            else MimeTypeEnum.IMAGE_JPEG
-                        ),
-                        upscale_factor=request_dto.upscale_factor,
+            # Single pass over the results: keep the images stored in GCS and
+            # build their upscale requests (if needed) at the same time.
+            png = MimeTypeEnum.IMAGE_PNG
+            jpeg = MimeTypeEnum.IMAGE_JPEG
+            mime_type: MimeTypeEnum | None = None
+            generated_gcs_uris: List[str] = []
+            upscale_dtos: List[UpscaleImagenDto] = []
+            for img in all_generated_images:
+                image = img.image
+                if not (image and image.gcs_uri):
+                    continue
+                image_mime_type = png if image.mime_type == png else jpeg
+                if mime_type is None:
+                    mime_type = image_mime_type
+                generated_gcs_uris.append(image.gcs_uri)
+                if request_dto.upscale_factor:
+                    upscale_dtos.append(
+                        UpscaleImagenDto(
+                            generation_model=request_dto.generation_model,
+                            user_image=image.gcs_uri,
+                            mime_type=image_mime_type,
+                            upscale_factor=request_dto.upscale_factor,
+                        )
                     )
-                    for img in valid_generated_images
-                    if img.image
-                ]
-                upscale_images = []
-                tasks = [
-                    self.upscale_image(request_dto=dto) for dto in upscale_dtos
-                ]
-                upscale_images = await asyncio.gather(*tasks)
 
-                permanent_gcs_uris = [
-                    img.image.gcs_uri
-                    for img in upscale_images
-                    if img and img.image and img.image.gcs_uri
+            if mime_type is None:
+                return None
+
+            if request_dto.upscale_factor:
+                # Upscale every image and sign its URL as soon as it is ready,
+                # so signing overlaps with the upscales still in flight.
+                tasks = [self._upscale_then_sign(dto) for dto in upscale_dtos]
+                signed_images = [
+                    signed for signed in await asyncio.gather(*tasks) if signed
                 ]
+                permanent_gcs_uris = [uri for uri, _ in signed_images]
+                presigned_urls = [url for _, url in signed_images]
             else:
-                permanent_gcs_uris = [
-                    img.image.gcs_uri
-                    for img in valid_generated_images
-                    if img.image and img.image.gcs_uri
-                ]
-
-            # 2. Create and run tasks to generate all presigned URLs in parallel
-            presigned_url_tasks = [
-                asyncio.to_thread(
-                    self.iam_signer_credentials.generate_presigned_url, uri
+                # Generate all presigned URLs in parallel
+                permanent_gcs_uris = generated_gcs_uris
+                presigned_urls = await asyncio.gather(
+                    *(
+                        asyncio.to_thread(
+                            self.iam_signer_credentials.generate_presigned_url,
+                            uri,
+                        )
+                        for uri in permanent_gcs_uris
+                    )
                 )
-                for uri in permanent_gcs_uris
-            ]
-            presigned_urls = await asyncio.gather(*presigned_url_tasks)
 
             end_time = time.monotonic()
             generation_time = end_time - start_time
@@ -382,12 +422,12 @@ class ImagenService:
             self.media_repo.save(media_post_to_save)
 
             return MediaItemResponse(
-                **media_post_to_save.model_dump(),
+                **media_post_to_save.__dict__,
                 presigned_urls=presigned_urls,
             )
 
         except Exception as e:
-            logger.error(f"Image generation API call failed: {e}")
+            logger.error("Image generation API call failed: %s", e)
             raise
 
     async def _generate_with_gemini(
@@ -474,15 +514,17 @@ class ImagenService:
                                 )
                             elif part.text is not None:
                                 logger.info(
-                                    f"Gemini Text Output (not an image part): {part.text}"
+                                    "Gemini Text Output (not an image part): %s",
+                                    part.text,
                                 )
 
             logger.info(
-                f"Number of images created by Gemini: {len(response_gemini)}"
+                "Number of images created by Gemini: %s",
+                len(response_gemini),
             )
             return response_gemini
         except Exception as e:
-            logger.error(f"Error during Gemini generation: {e}")
+            logger.error("Error during Gemini generation: %s", e)
             return []
 
     async def generate_image_for_vto(
@@ -581,8 +623,9 @@ class ImagenService:
                     product_image=types.Image(gcs_uri=garment_gcs_uri)
                 )
 
-                # Call the VTO API for this single step.
-                response = client.models.recontext_image(
+                # Call the VTO API for this single step. The async client keeps
+                # the event loop free while each try-on step renders.
+                response = await client.aio.models.recontext_image(
                     model=self.cfg.VTO_MODEL_ID,
                     source=types.RecontextImageSource(
                         person_image=person_image_part,
@@ -673,26 +716,19 @@ class ImagenService:
             self.media_repo.save(media_post_to_save)
 
             return MediaItemResponse(
-                **media_post_to_save.model_dump(),
+                **media_post_to_save.__dict__,
                 presigned_urls=presigned_urls,
             )
 
         except Exception as e:
-            logger.error(f"Image generation API call failed: {e}")
+            logger.error("Image generation API call failed: %s", e)
             raise
 
-    def recontextualize_product_in_scene(
+    async def recontextualize_product_in_scene(
         self, image_uris_list: list[str], prompt: str, sample_count: int
     ) -> list[str]:
         """Recontextualizes a product in a scene and returns a list of GCS URIs."""
-        client_options = {
-            "api_endpoint": f"{self.cfg.LOCATION}-aiplatform.googleapis.com"
-        }
-        client = aiplatform.gapic.PredictionServiceClient(
-            client_options=client_options
-        )
-
-        model_endpoint = f"projects/{self.cfg.PROJECT_ID}/locations/{self.cfg.LOCATION}/publishers/google/models/{self.cfg.MODEL_IMAGEN_PRODUCT_RECONTEXT}"
+        client = self.get_prediction_client()
 
         instance = {"productImages": []}
         for product_image_uri in image_uris_list:
@@ -704,26 +740,28 @@ class ImagenService:
 
         parameters = {"sampleCount": sample_count}
 
-        response = client.predict(
-            endpoint=model_endpoint, instances=[instance], parameters=parameters  # type: ignore
+        response = await asyncio.to_thread(
+            client.predict,
+            endpoint=_RECONTEXT_MODEL_ENDPOINT,
+            instances=[instance],  # type: ignore
+            parameters=parameters,  # type: ignore
         )
 
-        gcs_uris = []
-        for prediction in response.predictions:
-            if prediction.get("bytesBase64Encoded"):  # type: ignore
-                encoded_mask_string = prediction["bytesBase64Encoded"]  # type: ignore
-                mask_bytes = base64.b64decode(encoded_mask_string)
-
-                gcs_uri = self.gcs_service.store_to_gcs(
-                    folder="recontext_results",
-                    file_name=f"recontext_result_{uuid.uuid4()}.png",
-                    mime_type="image/png",
-                    contents=mask_bytes,
-                    decode=False,
-                )
-                gcs_uris.append(gcs_uri)
-
-        return gcs_uris
+        # Upload all the results concurrently; gather keeps their order.
+        upload_tasks = [
+            asyncio.to_thread(
+                self.gcs_service.store_to_gcs,
+                folder="recontext_results",
+                file_name=f"recontext_result_{uuid.uuid4()}.png",
+                mime_type="image/png",
+                # Decoded by store_to_gcs, inside the upload thread.
+                contents=prediction["bytesBase64Encoded"],  # type: ignore
+                decode=True,
+            )
+            for prediction in response.predictions
+            if prediction.get("bytesBase64Encoded")  # type: ignore
+        ]
+        return list(await asyncio.gather(*upload_tasks))
 
     def edit_image(
         self, request_dto: EditImagenDto
@@ -751,7 +789,10 @@ class ImagenService:
 
         try:
             logger.info(
-                f"models.image_models.edit_image: Requesting {request_dto.number_of_media} edited images for model {request_dto.generation_model} with output to {gcs_output_directory}"
+                "models.image_models.edit_image: Requesting %s edited images for model %s with output to %s",
+                request_dto.number_of_media,
+                request_dto.generation_model,
+                gcs_output_directory,
             )
             images_imagen_response = client.models.edit_image(
                 model=request_dto.generation_model,
@@ -788,13 +829,33 @@ class ImagenService:
                     )
 
             logger.info(
-                f"Number of images created by Imagen: {len(response_imagen)}"
+                "Number of images created by Imagen: %s",
+                len(response_imagen),
             )
             return response_imagen
         except Exception as e:
-            logger.error(f"API call failed: {e}")
+            logger.error("API call failed: %s", e)
             raise
 
+    async def _upscale_then_sign(
+        self, request_dto: UpscaleImagenDto
+    ) -> tuple[str, str] | None:
+        """
+        Upscales one image and signs its URL.
+
+        Returns:
+            The (gcs_uri, presigned_url) of the upscaled image, or None if the
+            upscale returned no image.
+        """
+        upscaled = await self.upscale_image(request_dto=request_dto)
+        if not (upscaled and upscaled.image and upscaled.image.gcs_uri):
+            return None
+        gcs_uri = upscaled.image.gcs_uri
+        presigned_url = await asyncio.to_thread(
+            self.iam_signer_credentials.generate_presigned_url, gcs_uri
+        )
+        return gcs_uri, presigned_url
+
     async def upscale_image(
         self, request_dto: UpscaleImagenDto
     ) -> ImageGenerationResult | None:
@@ -806,7 +867,7 @@ class ImagenService:
             # --- Step 1: Perform the Upscale API Call ---
             image_for_api = types.Image(gcs_uri=request_dto.user_image)
 
-            response = client.models.upscale_image(
+            response = await client.aio.models.upscale_image(
                 model=GenerationModelEnum.IMAGEN_3_002.value,
                 image=image_for_api,
                 upscale_factor=request_dto.upscale_factor,
@@ -829,8 +890,11 @@ class ImagenService:
                 )
                 upscaled_blob_name = f"upscaled_images/upscaled_{request_dto.upscale_factor}_{original_filename}"
 
-                final_gcs_uri = self.gcs_service.upload_bytes_to_gcs(
-                    upscaled_bytes, upscaled_blob_name, MimeTypeEnum.IMAGE_PNG
+                final_gcs_uri = await asyncio.to_thread(
+                    self.gcs_service.upload_bytes_to_gcs,
+                    upscaled_bytes,
+                    upscaled_blob_name,
+                    MimeTypeEnum.IMAGE_PNG,
                 )
 
                 if not final_gcs_uri:
@@ -855,5 +919,5 @@ class ImagenService:
                 )
 
         except Exception as e:
-            logger.error(f"Image upscaling generation API call failed: {e}")
+            logger.error("Image upscaling generation API call failed: %s", e)
             raise
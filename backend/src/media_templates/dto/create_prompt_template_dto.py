@@ -2,7 +2,6 @@ from typing import Annotated, List, Optional
 
 from pydantic import BaseModel, Field
 
-from src.common.base_dto import MimeTypeEnum
 from src.media_templates.schema.media_template_model import IndustryEnum
 
 
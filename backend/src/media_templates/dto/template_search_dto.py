@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional
 from pydantic import BaseModel, Field
 from src.media_templates.schema.media_template_model import IndustryEnum, MimeTypeEnum
 
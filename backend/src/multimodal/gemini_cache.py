@@ -0,0 +1,147 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import partial
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from src.config.config_service import config_service
+
+
+class GeminiResponseCache:
+    """
+    An in-process, thread-safe LRU cache with a TTL for Gemini text responses.
+
+    Entries are keyed by a hash of everything that determines the response
+    (model, response type, schema and full prompt), so only exact repeats of a
+    request are served from the cache. Concurrent misses for the same key are
+    coalesced: one caller fetches and the others wait for its result.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._ainflight: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Builds a compact cache key from the parts that identify a request."""
+        return hashlib.blake2b(
+            "\x1f".join(parts).encode("utf-8"), digest_size=16
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached value for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Stores `value`, evicting the least recently used entry if full."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_or_compute(self, key: str, fetch_fn: Callable[[], str]) -> str:
+        """
+        Returns the cached value for `key`, calling `fetch_fn` on a miss.
+        Empty responses are returned but not cached.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                future: Future = Future()
+                self._inflight[key] = future
+        if inflight is not None:
+            return inflight.result()
+
+        try:
+            value = fetch_fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            if value:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_or_compute(
+        self, key: str, fetch_fn: Callable[[], Awaitable[str]]
+    ) -> str:
+        """Async version of `get_or_compute`, awaiting `fetch_fn` on a miss."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        task = self._ainflight.get(key)
+        if task is None or task.get_loop() is not loop:
+            task = loop.create_task(self._afetch_and_set(key, fetch_fn))
+            self._ainflight[key] = task
+            task.add_done_callback(partial(self._forget_task, key))
+        # Shielded, so a cancelled caller doesn't cancel the shared fetch that
+        # other callers are waiting on.
+        return await asyncio.shield(task)
+
+    async def _afetch_and_set(
+        self, key: str, fetch_fn: Callable[[], Awaitable[str]]
+    ) -> str:
+        value = await fetch_fn()
+        if value:
+            self.set(key, value)
+        return value
+
+    def _forget_task(self, key: str, task: asyncio.Task) -> None:
+        if self._ainflight.get(key) is task:
+            del self._ainflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved, even if every caller went away.
+            task.exception()
+
+
+gemini_cache = GeminiResponseCache(
+    max_entries=config_service.GEMINI_CACHE_MAX_ENTRIES,
+    ttl_seconds=config_service.GEMINI_CACHE_TTL_SECONDS,
+)
@@ -23,7 +23,6 @@ from src.multimodal.dto.gemini_prompt_enhancer_dto import (
 )
 from src.auth.auth_guard import RoleChecker
 from src.multimodal.gemini_service import GeminiService
-from fastapi import APIRouter, Depends
 
 
 router = APIRouter(
@@ -58,8 +57,10 @@ async def rewrite_prompt_endpoint(
     This uses a deterministic, rule-based approach.
     """
     try:
-        rewritten_prompt = gemini_service.generate_random_or_rewrite_prompt(
-            rewrite_request.target_type, rewrite_request.user_prompt
+        rewritten_prompt = (
+            await gemini_service.agenerate_random_or_rewrite_prompt(
+                rewrite_request.target_type, rewrite_request.user_prompt
+            )
         )
         return RewrittenOrRandomPromptResponse(prompt=rewritten_prompt)
     except Exception as e:
@@ -83,7 +84,7 @@ async def random_prompt_endpoint(
     Useful for sparking creativity or for a "surprise me" feature.
     """
     try:
-        random_prompt = gemini_service.generate_random_or_rewrite_prompt(
+        random_prompt = await gemini_service.agenerate_random_or_rewrite_prompt(
             random_request.target_type
         )
         return RewrittenOrRandomPromptResponse(prompt=random_prompt)
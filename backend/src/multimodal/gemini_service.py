@@ -13,19 +13,23 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
+import asyncio
+import functools
 import logging
 from enum import Enum
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Dict, Iterator, List, Optional, Type, Union
 
+import httpx
+import orjson
 from google.cloud.firestore_v1.base_query import FieldFilter
-from google.genai import Client, types
-from pydantic import BaseModel, Field
+from google.genai import Client, errors, types
+from pydantic import BaseModel
 from tenacity import (
+    RetryCallState,
     retry,
-    retry_if_exception_type,
+    retry_if_exception,
     stop_after_attempt,
-    wait_exponential,
+    wait_random_exponential,
 )
 
 from src.brand_guidelines.dto.brand_guideline_search_dto import (
@@ -42,6 +46,8 @@ from src.config.config_service import config_service
 from src.images.dto.create_imagen_dto import CreateImagenDto
 from src.multimodal.dto.create_prompt_imagen_dto import CreatePromptImageDto
 from src.multimodal.dto.create_prompt_video_dto import CreatePromptVideoDto
+from src.multimodal.gemini_cache import gemini_cache
+from src.multimodal.rate_limiter import gemini_rate_limiter
 from src.multimodal.rewriters import (
     RANDOM_IMAGE_PROMPT_TEMPLATE,
     RANDOM_VIDEO_PROMPT_TEMPLATE,
@@ -55,6 +61,78 @@ from src.videos.dto.create_veo_dto import CreateVeoDto
 
 logger = logging.getLogger(__name__)
 
+# Only transient failures are worth retrying: 5xx responses from the API,
+# network errors/timeouts and 429 rate limits. Other client errors (bad
+# request, auth, schema validation) fail the same way on every attempt.
+_RETRYABLE_EXCEPTIONS = (errors.ServerError, httpx.TransportError, TimeoutError)
+_MAX_RETRY_AFTER_SECONDS = 30
+
+# Jittered, so concurrent requests hitting the same rate limit don't all retry
+# in lockstep.
+_jittered_backoff = wait_random_exponential(multiplier=1, min=2, max=10)
+
+
+def _is_retryable(exception: BaseException) -> bool:
+    if isinstance(exception, errors.ClientError):
+        return exception.code == 429
+    return isinstance(exception, _RETRYABLE_EXCEPTIONS)
+
+
+def _wait_before_retry(retry_state: RetryCallState) -> float:
+    """
+    Waits for the jittered backoff, or longer if a 429 response asked for it
+    with a numeric Retry-After header.
+    """
+    backoff = _jittered_backoff(retry_state)
+    exception = retry_state.outcome.exception() if retry_state.outcome else None
+    response = getattr(exception, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return backoff
+    try:
+        retry_after = float(headers.get("Retry-After", 0))
+    except ValueError:
+        return backoff
+    return max(backoff, min(retry_after, _MAX_RETRY_AFTER_SECONDS))
+
+
+# Instructions prepended to every Gemini image-to-image prompt, ahead of the
+# user's request. See `_prepare_prompt_enhancement`.
+_GEMINI_I2I_INSTRUCTIONS = (
+    "**Objective:** Perform a targeted edit on the source image based on the user's request.\n"
+    "**Guiding Principle:** Your primary goal is to follow the user's instructions precisely. Preserve all aspects of the original image (subject identity, background, lighting, composition) unless the user's request explicitly requires a change.\n\n"
+    "**Execution Flow:** Analyze the user's request and match it to one of the following scenarios. If no scenario fits perfectly, use the 'General Instruction' as a fallback.\n\n"
+    "--- Scenarios ---\n\n"
+    "**1. Garment/Accessory Edit** (e.g., 'change the shirt to blue', 'add sunglasses')\n"
+    "   - **Action:** Isolate and modify only the specified clothing or accessory item.\n"
+    "   - **Constraint:** You **MUST NOT** change the subject's identity, face, pose, or the background.\n\n"
+    "**2. Background Replacement** (e.g., 'change the background to a beach', 'put them in Paris')\n"
+    "   - **Action:** Replace the entire background with the new scene described.\n"
+    "   - **Constraint:** You **MUST** preserve the foreground subject's identity, pose, and clothing. Adjust lighting on the subject only as needed to blend them realistically into the new background.\n\n"
+    "**3. Pose Adjustment** (e.g., 'make them wave', 'change the pose to sitting')\n"
+    "   - **Action:** Adjust the subject's body to the new pose.\n"
+    "   - **Constraint:** You **MUST** preserve the subject's identity, clothing, and the background environment.\n\n"
+    "**4. Outpainting / Zoom Out** (e.g., 'zoom out', 'show more of the scene', 'make it a wide-angle shot')\n"
+    "   - **Action:** Extend the image outwards by generating new content that seamlessly matches the existing style (outpainting).\n"
+    "   - **Default:** If the user just says 'zoom out', interpret it as 'zoom out by at least 2x'. If they specify a different amount, follow their instruction.\n\n"
+    "**5. General Instruction (Fallback):**\n"
+    "   - **Action:** If the request does not fit the scenarios above, follow the user's instructions as literally as possible.\n"
+    "   - **Constraint:** Make the minimum necessary changes to fulfill the request, preserving as much of the original image as you can.\n\n"
+    "--- End of Scenarios ---\n\n"
+    "**User's Request:** "
+)
+
+
+def _to_json(value: Any) -> str:
+    """Pretty-prints a value as JSON for embedding in a prompt."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+
+
+@functools.lru_cache(maxsize=256)
+def _pretty_key(key: str) -> str:
+    """Formats a DTO field name for a prompt, e.g. "aspect_ratio" -> "Aspect Ratio"."""
+    return key.replace("_", " ").title()
+
 
 class PromptTargetEnum(str, Enum):
     IMAGE = "image"
@@ -66,6 +144,25 @@ class ResponseMimeTypeEnum(str, Enum):
     TEXT = "text/plain"
 
 
+_SCHEMA_BY_TARGET: Dict[PromptTargetEnum, Type[BaseModel]] = {
+    PromptTargetEnum.IMAGE: CreatePromptImageDto,
+    PromptTargetEnum.VIDEO: CreatePromptVideoDto,
+}
+
+# Rewrites only ever use these few configs, so build them once instead of on
+# every call. Custom schemas passed by callers still get a fresh config.
+_TEXT_CONFIG = types.GenerateContentConfig(
+    response_mime_type=ResponseMimeTypeEnum.TEXT.value
+)
+_JSON_CONFIG_BY_SCHEMA: Dict[Type[BaseModel], types.GenerateContentConfig] = {
+    schema: types.GenerateContentConfig(
+        response_mime_type=ResponseMimeTypeEnum.JSON.value,
+        response_schema=schema,
+    )
+    for schema in _SCHEMA_BY_TARGET.values()
+}
+
+
 class GeminiService:
     """
     A dedicated service for interactions with Google's Gemini models.
@@ -80,17 +177,48 @@ class GeminiService:
         self.brand_guideline_repo = BrandGuidelineRepository()
 
     def _get_response_schema(self, target: PromptTargetEnum) -> Type[BaseModel]:
-        """Dynamically gets the Pydantic schema based on the target type."""
-        if target is PromptTargetEnum.IMAGE:
-            return CreatePromptImageDto
-        if target is PromptTargetEnum.VIDEO:
-            return CreatePromptVideoDto
-        raise ValueError(f"No response schema defined for target: {target}")
+        """Gets the Pydantic schema based on the target type."""
+        schema = _SCHEMA_BY_TARGET.get(target)
+        if schema is None:
+            raise ValueError(f"No response schema defined for target: {target}")
+        return schema
+
+    def _get_structured_prompt_config(
+        self,
+        target_type: PromptTargetEnum,
+        response_mime_type: ResponseMimeTypeEnum,
+        response_schema: Type[BaseModel] | None = None,
+    ) -> Optional[types.GenerateContentConfig]:
+        """Returns the generation config for a rewrite, or None if unsupported."""
+        if response_mime_type is ResponseMimeTypeEnum.JSON:
+            schema = response_schema or self._get_response_schema(target_type)
+            config = _JSON_CONFIG_BY_SCHEMA.get(schema)
+            if config is None:
+                config = types.GenerateContentConfig(
+                    response_mime_type=response_mime_type.value,
+                    response_schema=schema,
+                )
+            return config
+        if response_mime_type is ResponseMimeTypeEnum.TEXT:
+            return _TEXT_CONFIG
+        return None
+
+    def _get_cache_key(
+        self, full_prompt: str, config: types.GenerateContentConfig
+    ) -> str:
+        """Keys a rewrite by everything that determines Gemini's response."""
+        schema = config.response_schema
+        return gemini_cache.make_key(
+            self.rewriter_model,
+            config.response_mime_type or "",
+            getattr(schema, "__name__", "") if schema else "",
+            full_prompt,
+        )
 
     @retry(
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        wait=_wait_before_retry,
         stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(Exception),
+        retry=retry_if_exception(_is_retryable),
         reraise=True,
     )
     def generate_structured_prompt(
@@ -100,6 +228,7 @@ class GeminiService:
         prompt_template: str,
         response_mime_type: ResponseMimeTypeEnum = ResponseMimeTypeEnum.JSON,
         response_schema: Type[BaseModel] | None = None,
+        use_cache: bool = True,
     ) -> str:
         """
         Rewrites a user prompt using Gemini into a structured JSON format.
@@ -108,72 +237,144 @@ class GeminiService:
             original_prompt: The initial, unstructured prompt from the user.
             target_type: The target output type (IMAGE or VIDEO).
             prompt_template: The instruction template for the Gemini model.
+            use_cache: Whether an identical earlier request may be answered
+                from the in-process response cache.
 
         Returns:
             A dictionary parsed from Gemini's JSON response.
         """
         full_prompt = f"{prompt_template} {original_prompt}"
-        response_schema = response_schema or self._get_response_schema(
-            target_type
+        config = self._get_structured_prompt_config(
+            target_type, response_mime_type, response_schema
         )
+        if config is None:
+            return ""
+
+        def fetch() -> str:
+            gemini_rate_limiter.acquire()
+            response = self.client.models.generate_content(
+                model=self.rewriter_model,
+                contents=full_prompt,
+                config=config,
+            )
+            return response.text or ""
 
         try:
-            response = None
-            if response_mime_type.value == ResponseMimeTypeEnum.JSON.value:
-                response = self.client.models.generate_content(
-                    model=self.rewriter_model,
-                    contents=full_prompt,
-                    config=types.GenerateContentConfig(
-                        response_mime_type=response_mime_type.value,
-                        response_schema=response_schema,
-                    ),
-                )
-            elif response_mime_type.value == ResponseMimeTypeEnum.TEXT.value:
-                response = self.client.models.generate_content(
-                    model=self.rewriter_model,
-                    contents=full_prompt,
-                    config=types.GenerateContentConfig(
-                        response_mime_type=response_mime_type.value
-                    ),
-                )
-            else:
-                return ""
+            if not use_cache:
+                return fetch()
+            return gemini_cache.get_or_compute(
+                self._get_cache_key(full_prompt, config), fetch
+            )
+        except Exception as e:
+            logger.error(
+                "Failed to generate structured prompt for '%s': %s",
+                original_prompt,
+                e,
+            )
+            raise
 
+    @retry(
+        wait=_wait_before_retry,
+        stop=stop_after_attempt(3),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
+    )
+    async def agenerate_structured_prompt(
+        self,
+        original_prompt: str,
+        target_type: PromptTargetEnum,
+        prompt_template: str,
+        response_mime_type: ResponseMimeTypeEnum = ResponseMimeTypeEnum.JSON,
+        response_schema: Type[BaseModel] | None = None,
+        use_cache: bool = True,
+    ) -> str:
+        """
+        Async version of `generate_structured_prompt`, using the non-blocking
+        GenAI client so the event loop is free while Gemini responds.
+        """
+        full_prompt = f"{prompt_template} {original_prompt}"
+        config = self._get_structured_prompt_config(
+            target_type, response_mime_type, response_schema
+        )
+        if config is None:
+            return ""
+
+        async def fetch() -> str:
+            await gemini_rate_limiter.aacquire()
+            response = await self.client.aio.models.generate_content(
+                model=self.rewriter_model,
+                contents=full_prompt,
+                config=config,
+            )
             return response.text or ""
+
+        try:
+            if not use_cache:
+                return await fetch()
+            return await gemini_cache.aget_or_compute(
+                self._get_cache_key(full_prompt, config), fetch
+            )
         except Exception as e:
             logger.error(
-                f"Failed to generate structured prompt for '{original_prompt}': {e}"
+                "Failed to generate structured prompt for '%s': %s",
+                original_prompt,
+                e,
             )
             raise
 
+    def _get_random_or_rewrite_template(
+        self, target_type: PromptTargetEnum, original_prompt: str
+    ) -> str:
+        """Picks the random prompt template, or the rewrite one if a prompt is given."""
+        if not original_prompt:
+            return (
+                RANDOM_IMAGE_PROMPT_TEMPLATE
+                if target_type is PromptTargetEnum.IMAGE
+                else RANDOM_VIDEO_PROMPT_TEMPLATE
+            )
+        return (
+            REWRITE_IMAGE_TEXT_PROMPT_TEMPLATE
+            if target_type is PromptTargetEnum.IMAGE
+            else REWRITE_VIDEO_TEXT_PROMPT_TEMPLATE
+        )
+
     def generate_random_or_rewrite_prompt(
         self, target_type: PromptTargetEnum, original_prompt: str = ""
     ) -> str:
         """Generates a completely new, random, and creative text prompt."""
         try:
-            prompt_template = RANDOM_IMAGE_PROMPT_TEMPLATE
-
-            if not original_prompt:
-                prompt_template = (
-                    RANDOM_IMAGE_PROMPT_TEMPLATE
-                    if target_type.value == PromptTargetEnum.IMAGE
-                    else RANDOM_VIDEO_PROMPT_TEMPLATE
-                )
-            else:
-                prompt_template = (
-                    REWRITE_IMAGE_TEXT_PROMPT_TEMPLATE
-                    if target_type.value == PromptTargetEnum.IMAGE
-                    else REWRITE_VIDEO_TEXT_PROMPT_TEMPLATE
-                )
             response = self.generate_structured_prompt(
                 original_prompt=original_prompt,
                 target_type=target_type,
-                prompt_template=prompt_template,
+                prompt_template=self._get_random_or_rewrite_template(
+                    target_type, original_prompt
+                ),
                 response_mime_type=ResponseMimeTypeEnum.TEXT,
+                # Random and rewrite requests ask for a fresh variant each time.
+                use_cache=False,
             )
             return response
         except Exception as e:
-            logger.error(f"Failed to generate random prompt: {e}")
+            logger.error("Failed to generate random prompt: %s", e)
+            raise
+
+    async def agenerate_random_or_rewrite_prompt(
+        self, target_type: PromptTargetEnum, original_prompt: str = ""
+    ) -> str:
+        """Async version of `generate_random_or_rewrite_prompt`."""
+        try:
+            return await self.agenerate_structured_prompt(
+                original_prompt=original_prompt,
+                target_type=target_type,
+                prompt_template=self._get_random_or_rewrite_template(
+                    target_type, original_prompt
+                ),
+                response_mime_type=ResponseMimeTypeEnum.TEXT,
+                # Random and rewrite requests ask for a fresh variant each time.
+                use_cache=False,
+            )
+        except Exception as e:
+            logger.error("Failed to generate random prompt: %s", e)
             raise
 
     def _convert_dto_to_string(self, dto: BaseModel) -> str:
@@ -181,40 +382,32 @@ class GeminiService:
         Private helper to convert a DTO into a formatted string for prompting.
         This consolidates the repetitive logic from the original file.
         """
-        # Use model_dump_json and then reload it to ensure all values, especially
-        # enums, are converted to their primitive string/number/etc. values
-        # instead of their Python object representation.
-        json_string = dto.model_dump_json(exclude_unset=True)
-        fields = json.loads(json_string)
+        # mode="json" converts all values, especially enums, to their primitive
+        # string/number/etc. values in a single pass, without a round-trip
+        # through a JSON string.
+        fields = dto.model_dump(mode="json", exclude_unset=True)
 
         # The main 'prompt' field is the base, others are attributes
         prompt_base = fields.pop("prompt", "")
 
-        attributes = [prompt_base]
+        attributes = [prompt_base] if prompt_base else []
         for key, value in fields.items():
             if value:  # Ensure value is not None or empty
-                formatted_key = key.replace("_", " ").title()
-                attributes.append(f"- {formatted_key}: {value}")
-        return "\n".join(filter(None, attributes))
+                attributes.append(f"- {_pretty_key(key)}: {value}")
+        return "\n".join(attributes)
 
-    def enhance_prompt_from_dto(
+    def _prepare_prompt_enhancement(
         self,
         dto: Union[CreateImagenDto, CreateVeoDto],
         target_type: PromptTargetEnum,
-        response_mime_type: ResponseMimeTypeEnum = ResponseMimeTypeEnum.JSON,
-    ) -> str:
+    ) -> Optional[tuple[str, str]]:
         """
-        Enhances a partially filled DTO by converting it to a string,
-        then asking Gemini to generate a complete, structured prompt.
-
-        This single method replaces the four repetitive `rewrite_for_*` methods.
-
-        Args:
-            dto: The input DTO, which can be for an image or video.
-            target_type: The target output type (IMAGE or VIDEO).
+        Applies the prompt prefixes (Gemini i2i instructions or the workspace
+        brand guidelines) to the DTO and builds the rewriter input.
 
         Returns:
-            A dictionary containing the complete, structured prompt data from Gemini.
+            The (prompt_string, prompt_template) to send to the rewriter, or
+            None if `dto.prompt` must be used as-is, without rewriting.
         """
         if target_type not in [PromptTargetEnum.IMAGE, PromptTargetEnum.VIDEO]:
             raise ValueError("Invalid target_type. Must be IMAGE or VIDEO.")
@@ -231,29 +424,7 @@ class GeminiService:
         )
 
         if is_gemini_i2i:
-            dto.prompt = (
-                "**Objective:** Perform a targeted edit on the source image based on the user's request.\n"
-                "**Guiding Principle:** Your primary goal is to follow the user's instructions precisely. Preserve all aspects of the original image (subject identity, background, lighting, composition) unless the user's request explicitly requires a change.\n\n"
-                "**Execution Flow:** Analyze the user's request and match it to one of the following scenarios. If no scenario fits perfectly, use the 'General Instruction' as a fallback.\n\n"
-                "--- Scenarios ---\n\n"
-                "**1. Garment/Accessory Edit** (e.g., 'change the shirt to blue', 'add sunglasses')\n"
-                "   - **Action:** Isolate and modify only the specified clothing or accessory item.\n"
-                "   - **Constraint:** You **MUST NOT** change the subject's identity, face, pose, or the background.\n\n"
-                "**2. Background Replacement** (e.g., 'change the background to a beach', 'put them in Paris')\n"
-                "   - **Action:** Replace the entire background with the new scene described.\n"
-                "   - **Constraint:** You **MUST** preserve the foreground subject's identity, pose, and clothing. Adjust lighting on the subject only as needed to blend them realistically into the new background.\n\n"
-                "**3. Pose Adjustment** (e.g., 'make them wave', 'change the pose to sitting')\n"
-                "   - **Action:** Adjust the subject's body to the new pose.\n"
-                "   - **Constraint:** You **MUST** preserve the subject's identity, clothing, and the background environment.\n\n"
-                "**4. Outpainting / Zoom Out** (e.g., 'zoom out', 'show more of the scene', 'make it a wide-angle shot')\n"
-                "   - **Action:** Extend the image outwards by generating new content that seamlessly matches the existing style (outpainting).\n"
-                "   - **Default:** If the user just says 'zoom out', interpret it as 'zoom out by at least 2x'. If they specify a different amount, follow their instruction.\n\n"
-                "**5. General Instruction (Fallback):**\n"
-                "   - **Action:** If the request does not fit the scenarios above, follow the user's instructions as literally as possible.\n"
-                "   - **Constraint:** Make the minimum necessary changes to fulfill the request, preserving as much of the original image as you can.\n\n"
-                "--- End of Scenarios ---\n\n"
-                f"**User's Request:** {dto.prompt}"
-            )
+            dto.prompt = _GEMINI_I2I_INSTRUCTIONS + dto.prompt
 
             # For Gemini image-to-image, we do NOT want to rewrite the prompt into a
             # complex JSON structure. The detailed instructions above are designed to
@@ -261,7 +432,7 @@ class GeminiService:
             # changes. Bypassing the structured prompt generation prevents the model
             # from deforming or completely changing the original image.
             # We also set the response mime type to TEXT to reflect this.
-            return dto.prompt
+            return None
 
         # --- Prepend Brand Guidelines if available ---
         if dto.workspace_id and not is_gemini_i2i:
@@ -294,7 +465,8 @@ class GeminiService:
                 dto.prompt = brand_guideline_prefix + dto.prompt
             else:
                 logger.info(
-                    f"No brand guidelines found for workspace '{dto.workspace_id}'."
+                    "No brand guidelines found for workspace '%s'.",
+                    dto.workspace_id,
                 )
 
         prompt_template = (
@@ -302,7 +474,31 @@ class GeminiService:
             if target_type == PromptTargetEnum.IMAGE
             else REWRITE_VIDEO_JSON_PROMPT_TEMPLATE
         )
-        prompt_string = self._convert_dto_to_string(dto)
+        return self._convert_dto_to_string(dto), prompt_template
+
+    def enhance_prompt_from_dto(
+        self,
+        dto: Union[CreateImagenDto, CreateVeoDto],
+        target_type: PromptTargetEnum,
+        response_mime_type: ResponseMimeTypeEnum = ResponseMimeTypeEnum.JSON,
+    ) -> str:
+        """
+        Enhances a partially filled DTO by converting it to a string,
+        then asking Gemini to generate a complete, structured prompt.
+
+        This single method replaces the four repetitive `rewrite_for_*` methods.
+
+        Args:
+            dto: The input DTO, which can be for an image or video.
+            target_type: The target output type (IMAGE or VIDEO).
+
+        Returns:
+            A dictionary containing the complete, structured prompt data from Gemini.
+        """
+        prepared = self._prepare_prompt_enhancement(dto, target_type)
+        if prepared is None:
+            return dto.prompt
+        prompt_string, prompt_template = prepared
 
         return self.generate_structured_prompt(
             original_prompt=prompt_string,
@@ -311,10 +507,34 @@ class GeminiService:
             response_mime_type=response_mime_type,
         )
 
+    async def aenhance_prompt_from_dto(
+        self,
+        dto: Union[CreateImagenDto, CreateVeoDto],
+        target_type: PromptTargetEnum,
+        response_mime_type: ResponseMimeTypeEnum = ResponseMimeTypeEnum.JSON,
+    ) -> str:
+        """
+        Async version of `enhance_prompt_from_dto`. The brand guideline lookup
+        runs in a thread and the rewrite uses the non-blocking GenAI client.
+        """
+        prepared = await asyncio.to_thread(
+            self._prepare_prompt_enhancement, dto, target_type
+        )
+        if prepared is None:
+            return dto.prompt
+        prompt_string, prompt_template = prepared
+
+        return await self.agenerate_structured_prompt(
+            original_prompt=prompt_string,
+            target_type=target_type,
+            prompt_template=prompt_template,
+            response_mime_type=response_mime_type,
+        )
+
     @retry(
-        wait=wait_exponential(multiplier=1, min=2, max=10),
+        wait=_wait_before_retry,
         stop=stop_after_attempt(3),
-        retry=retry_if_exception_type(Exception),
+        retry=retry_if_exception(_is_retryable),
         reraise=True,
     )
     def generate_text(self, prompt: str, model_id: Optional[str] = None) -> str:
@@ -336,26 +556,45 @@ class GeminiService:
         # Use the provided model_id or fall back to the service's default rewriter model
         target_model = model_id or self.rewriter_model
 
-        logger.info(f"Sending text generation request to model: {target_model}")
+        logger.info(
+            "Sending text generation request to model: %s",
+            target_model,
+        )
         try:
-            response = self.client.models.generate_content(
-                model=target_model,
-                contents=prompt,
-                # Configure for a simple text response without a schema
-                config=types.GenerateContentConfig(
-                    response_mime_type="text/plain"
-                ),
-            )
+            text = "".join(self.generate_text_stream(prompt, target_model))
             logger.info("Successfully received text response from Gemini.")
             # Strip any leading/trailing whitespace from the response
-            return response.text.strip() if response.text else ""
+            return text.strip()
         except Exception as e:
             # Log the error with part of the prompt for context
             logger.error(
-                f"Gemini text generation failed for prompt '{prompt[:100]}...': {e}"
+                "Gemini text generation failed for prompt '%s...': %s",
+                prompt[:100],
+                e,
             )
             raise
 
+    def generate_text_stream(
+        self, prompt: str, model_id: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Streams plain text from a Gemini model, yielding each chunk as soon as
+        it is decoded instead of waiting for the full response.
+
+        Unlike `generate_text`, this is not retried: chunks that were already
+        yielded can't be taken back.
+        """
+        gemini_rate_limiter.acquire()
+        stream = self.client.models.generate_content_stream(
+            model=model_id or self.rewriter_model,
+            contents=prompt,
+            # Configure for a simple text response without a schema
+            config=_TEXT_CONFIG,
+        )
+        for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
     def extract_brand_info_from_pdf(self, pdf_gcs_uri: str) -> Dict[str, Any]:
         """
         Uses a multimodal model to analyze a PDF from GCS and extract structured
@@ -367,7 +606,7 @@ class GeminiService:
         Returns:
             A dictionary containing the extracted brand information.
         """
-        logger.info(f"Starting brand info extraction for PDF: {pdf_gcs_uri}")
+        logger.info("Starting brand info extraction for PDF: %s", pdf_gcs_uri)
 
         pdf_file = types.Part.from_uri(
             file_uri=pdf_gcs_uri, mime_type="application/pdf"
@@ -385,6 +624,7 @@ class GeminiService:
         """
 
         try:
+            gemini_rate_limiter.acquire()
             response = self.client.models.generate_content(
                 model=self.cfg.GEMINI_MODEL_ID,
                 contents=[pdf_file, prompt],
@@ -394,12 +634,20 @@ class GeminiService:
                 ),
             )
 
-            # The model is configured to return JSON, so we can parse it directly.
-            extracted_data = json.loads(response.text or "{}")
-            return extracted_data
+            # The SDK already validated the JSON against the schema, so reuse
+            # that result instead of parsing the response text a second time.
+            if isinstance(response.parsed, BrandGuidelineModel):
+                return response.parsed.model_dump(
+                    by_alias=True, exclude_unset=True
+                )
+            # Partial chunks may not satisfy the full schema (e.g. no brand
+            # name); keep whatever JSON the model returned for aggregation.
+            return orjson.loads(response.text or "{}")
         except Exception as e:
             logger.error(
-                f"Failed to extract brand info from PDF {pdf_gcs_uri}: {e}"
+                "Failed to extract brand info from PDF %s: %s",
+                pdf_gcs_uri,
+                e,
             )
             return {}
 
@@ -423,7 +671,8 @@ class GeminiService:
             return BrandGuidelineModel(**partial_results[0])
 
         logger.info(
-            f"Aggregating {len(partial_results)} partial brand info results."
+            "Aggregating %s partial brand info results.",
+            len(partial_results),
         )
 
         # --- Step 1: Deterministic Aggregation in Python ---
@@ -457,13 +706,13 @@ class GeminiService:
         You are an expert in brand identity. You have been given partial data extracted from a large brand guidelines document. Your task is to synthesize this data into a single, final, and coherent JSON object.
 
         1.  **Color Palette**: Here is a list of all hex color codes found across the document chunks. Your task is to select the most representative and primary brand colors to create the final palette. **Crucially, you MUST NOT invent new colors.** Choose only from this list:
-            {json.dumps(sorted(list(all_colors)), indent=2)}
+            {_to_json(sorted(list(all_colors)))}
 
         2.  **Tone of Voice Summaries**: Here are the partial summaries describing the brand's voice:
-            {json.dumps(tone_summaries, indent=2)}
+            {_to_json(tone_summaries)}
 
         3.  **Visual Style Summaries**: Here are the partial summaries describing the brand's visual style:
-            {json.dumps(visual_summaries, indent=2)}
+            {_to_json(visual_summaries)}
 
         Please generate a final, consolidated JSON object with three keys:
         -   "color_palette": A list of hex strings representing the final, curated brand colors, chosen from the list provided.
@@ -475,6 +724,7 @@ class GeminiService:
 
         try:
             # We expect a subset of the BrandGuidelineModel, so we can use it as the schema.
+            gemini_rate_limiter.acquire()
             response = self.client.models.generate_content(
                 model=self.rewriter_model,
                 contents=prompt,
@@ -485,10 +735,16 @@ class GeminiService:
             )
 
             # --- Step 3: Combine Python and AI results ---
-            aggregated_data = json.loads(response.text or "{}")
-            return BrandGuidelineModel(**aggregated_data)
+            # The SDK already validated the JSON response into the schema.
+            if isinstance(response.parsed, BrandGuidelineModel):
+                return response.parsed
+            logger.error(
+                "Aggregated brand info from Gemini did not match the schema."
+            )
+            return None
         except Exception as e:
             logger.error(
-                f"Failed to aggregate brand info summaries with Gemini: {e}"
+                "Failed to aggregate brand info summaries with Gemini: %s",
+                e,
             )
             return None
@@ -0,0 +1,80 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import os
+import threading
+import time
+
+from src.config.config_service import config_service
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket shared by sync and async callers.
+
+    Each call reserves a token up front and then waits until that token is
+    due, so callers are released in arrival order at `rate_per_second`, after
+    an initial burst of up to `burst` immediate calls. A rate of 0 or less
+    disables the limit.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate_per_second = rate_per_second
+        self.burst = max(burst, 1)
+        self._reset()
+
+    def _reset(self) -> None:
+        """Starts over with a full bucket and a fresh lock."""
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token and returns how many seconds to wait before using it."""
+        if self.rate_per_second <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated_at
+            self._tokens = min(
+                self.burst, self._tokens + elapsed * self.rate_per_second
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+    def acquire(self) -> None:
+        """Blocks the calling thread until a token is available."""
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        """Waits, without blocking the event loop, until a token is available."""
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+gemini_rate_limiter = TokenBucket(
+    rate_per_second=config_service.GEMINI_MAX_REQUESTS_PER_SECOND,
+    burst=config_service.GEMINI_RATE_LIMIT_BURST,
+)
+
+# Each process gets its own budget (see GEMINI_MAX_REQUESTS_PER_SECOND). A
+# forked child also must not inherit a lock held by another parent thread.
+os.register_at_fork(after_in_child=gemini_rate_limiter._reset)
@@ -35,7 +35,6 @@ from src.source_assets.dto.vto_assets_response_dto import VtoAssetsResponseDto
 from src.source_assets.schema.source_asset_model import (
     AssetScopeEnum,
     AssetTypeEnum,
-    SourceAssetModel,
 )
 from src.source_assets.source_asset_service import SourceAssetService
 from src.users.repository.user_repository import UserRepository
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List
 from pydantic import BaseModel, EmailStr, Field
 from src.users.user_model import UserRoleEnum
 
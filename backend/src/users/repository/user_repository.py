@@ -1,5 +1,4 @@
-import datetime
-from typing import Any, Dict, List, Optional
+from typing import Optional
 
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_aggregation import AggregationResult
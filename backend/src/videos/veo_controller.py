@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import APIRouter, Depends, HTTPException
 from fastapi import status as Status
 
 from src.auth.auth_guard import RoleChecker, get_current_user
@@ -20,6 +22,7 @@ from src.galleries.dto.gallery_response_dto import MediaItemResponse
 from src.users.user_model import UserModel, UserRoleEnum
 from src.videos.dto.concatenate_videos_dto import ConcatenateVideosDto
 from src.videos.dto.create_veo_dto import CreateVeoDto
+from src.videos.veo_dependencies import get_process_pool, get_veo_service
 from src.videos.veo_service import VeoService
 from src.workspaces.workspace_auth_guard import workspace_auth_service
 
@@ -39,9 +42,9 @@ router = APIRouter(
 @router.post("/generate-videos")
 async def generate_videos(
     video_request: CreateVeoDto,
-    request: Request,
     current_user: UserModel = Depends(get_current_user),
-    service: VeoService = Depends(),
+    service: VeoService = Depends(get_veo_service),
+    executor: ProcessPoolExecutor = Depends(get_process_pool),
 ) -> MediaItemResponse | None:
     try:
         # Use our centralized dependency to authorize the user for the workspace
@@ -50,9 +53,6 @@ async def generate_videos(
             workspace_id=video_request.workspace_id, user=current_user
         )
 
-        # Get the process pool from the application state
-        executor = request.app.state.process_pool
-
         placeholder_item = service.start_video_generation_job(
             request_dto=video_request,
             user=current_user,
@@ -80,9 +80,9 @@ async def generate_videos(
 )
 async def concatenate_videos(
     concat_request: ConcatenateVideosDto,
-    request: Request,
     current_user: UserModel = Depends(get_current_user),
-    service: VeoService = Depends(),
+    service: VeoService = Depends(get_veo_service),
+    executor: ProcessPoolExecutor = Depends(get_process_pool),
 ):
     """
     Creates a new video by concatenating two or more existing videos in a specified order.
@@ -92,7 +92,6 @@ async def concatenate_videos(
         workspace_auth_service.authorize(
             workspace_id=concat_request.workspace_id, user=current_user
         )
-        executor = request.app.state.process_pool
         placeholder_item = service.start_video_concatenation_job(
             request_dto=concat_request, user=current_user, executor=executor
         )
@@ -112,7 +111,7 @@ async def concatenate_videos(
 )
 async def get_media_item_by_id(
     media_id: str,
-    media_service: VeoService = Depends(),
+    media_service: VeoService = Depends(get_veo_service),
 ):
     """
     Retrieves a single media item by its unique ID, including its current status
@@ -0,0 +1,29 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import Request
+
+from src.videos.veo_service import VeoService
+
+
+def get_veo_service(request: Request) -> VeoService:
+    """Returns the app-wide VeoService created at startup."""
+    return request.app.state.veo_service
+
+
+def get_process_pool(request: Request) -> ProcessPoolExecutor:
+    """Returns the process pool reserved for the long-running video jobs."""
+    return request.app.state.process_pool
@@ -16,12 +16,14 @@
 import asyncio
 import logging
 import os
+import posixpath
 import shutil
-import subprocess
 import sys
+import tempfile
 import time
 import uuid
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
 from typing import List, Optional
 
 from google.cloud.logging import Client as LoggerClient
@@ -54,6 +56,27 @@ from src.videos.dto.create_veo_dto import CreateVeoDto
 logger = logging.getLogger(__name__)
 
 
+def _log_background_job_failure(media_item_id: str, future: Future) -> None:
+    """
+    Done callback for jobs submitted to the process pool. Jobs are not awaited
+    by the request, so errors that escape the worker (e.g. a broken pool or an
+    unpicklable argument) would otherwise be dropped silently.
+    """
+    if future.cancelled():
+        logger.warning(
+            "Background job for media item %s was cancelled.", media_item_id
+        )
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error(
+            "Background job for media item %s failed: %s",
+            media_item_id,
+            error,
+            exc_info=error,
+        )
+
+
 # --- STANDALONE WORKER FUNCTION ---
 # This function will run in the background process. It is defined outside the class.
 def _process_video_in_background(
@@ -92,255 +115,295 @@ def _process_video_in_background(
             handler.setFormatter(formatter)
             worker_logger.addHandler(handler)
 
-        # Create new instances of dependencies within this process
-        media_repo = MediaRepository()
-        gemini_service = GeminiService()
-        gcs_service = GcsService()
-        source_asset_repo = SourceAssetRepository()
-        try:
-            client = GenAIModelSetup.init()
-            cfg = config_service
-            gcs_output_directory = f"gs://{cfg.GENMEDIA_BUCKET}"
-
-            rewritten_prompt = gemini_service.enhance_prompt_from_dto(
-                dto=request_dto, target_type=PromptTargetEnum.VIDEO
-            )
-            original_prompt = request_dto.prompt
-            request_dto.prompt = rewritten_prompt
-
-            # --- Handle Source Assets for API Call ---
-            start_image_for_api: Optional[types.Image] = None
-            end_image_for_api: Optional[types.Image] = None
-            original_source_video_item_link: Optional[SourceMediaItemLink] = (
-                None
-            )
-            # --- Handle Video Extension ---
-            source_video_for_api: Optional[types.Video] = None
-
-            if request_dto.source_video_asset_id:
-                video_asset = source_asset_repo.get_by_id(
-                    request_dto.source_video_asset_id
-                )
-                if video_asset:
-                    source_video_for_api = types.Video(uri=video_asset.gcs_uri)
-                else:
-                    worker_logger.warning(
-                        f"Could not find source video asset: {request_dto.source_video_asset_id}"
-                    )
-            if request_dto.start_image_asset_id:
-                start_asset = source_asset_repo.get_by_id(
-                    request_dto.start_image_asset_id
-                )
-                if start_asset:
-                    start_image_for_api = types.Image(
-                        gcs_uri=start_asset.gcs_uri, mime_type=start_asset.mime_type
-                    )
+        # The job itself is I/O bound (Gemini, Veo, Firestore, GCS), so it runs
+        # on an event loop inside this worker process. Independent steps, like
+        # the source asset lookups or the per-video thumbnails, overlap instead
+        # of running one after the other.
+        asyncio.run(
+            _run_video_generation_job(media_item_id, request_dto, worker_logger)
+        )
+    except Exception as e:
+        worker_logger.error(
+            "Video generation task failed.",
+            extra={"json_fields": {"media_id": media_item_id, "error": str(e)}},
+            exc_info=True,
+        )  # exc_info=True still adds the full traceback
 
-            if request_dto.end_image_asset_id:
-                end_asset = source_asset_repo.get_by_id(
-                    request_dto.end_image_asset_id
-                )
-                if end_asset:
-                    end_image_for_api = types.Image(
-                        gcs_uri=end_asset.gcs_uri, mime_type=end_asset.mime_type
-                    )
 
-            # --- Handle Generated Inputs (from other MediaItems) ---
-            if request_dto.source_media_items:
-                for gen_input in request_dto.source_media_items:
-                    parent_item = media_repo.get_by_id(gen_input.media_item_id)
-                    if (
-                        parent_item
-                        and parent_item.gcs_uris
-                        and 0 <= gen_input.media_index < len(parent_item.gcs_uris)
-                    ):
-                        gcs_uri = parent_item.gcs_uris[gen_input.media_index]
-                        image_for_api = types.Image(
-                            gcs_uri=gcs_uri, mime_type=parent_item.mime_type
-                        )
+def _store_video_thumbnail(
+    gcs_service: GcsService, video_uri: str, bucket_name: str
+) -> Optional[str]:
+    """
+    Downloads a generated video, extracts a thumbnail from its first frame and
+    uploads it to GCS. This is a blocking function.
 
-                        if gen_input.role == AssetRoleEnum.START_FRAME:
-                            start_image_for_api = image_for_api
-                        elif gen_input.role == AssetRoleEnum.END_FRAME:
-                            end_image_for_api = image_for_api
-                        elif (
-                            gen_input.role
-                            == AssetRoleEnum.VIDEO_EXTENSION_SOURCE
-                        ):
-                            original_source_video_item_link = gen_input
-                            source_video_for_api = types.Video(uri=gcs_uri)
-                    else:
-                        worker_logger.warning(
-                            f"Could not find or use generated_input: {gen_input.media_item_id} at index {gen_input.media_index}"
-                        )
+    Returns:
+        The thumbnail GCS URI ("" if the upload failed), or None if no
+        thumbnail could be produced.
+    """
+    output_path = video_uri.removeprefix(f"gs://{bucket_name}/")
 
-            all_generated_videos: List[types.GeneratedVideo] = []
+    # Every sample of an operation lives in the same GCS folder and these run
+    # concurrently, so each video gets its own scratch directory to work in
+    # and clean up.
+    temp_dir = tempfile.mkdtemp(prefix="thumbnails_")
+    try:
+        # Step 1: Download the Video from GCS
+        downloaded_video_path = gcs_service.download_from_gcs(
+            gcs_uri_path=output_path,
+            destination_file_path=os.path.join(
+                temp_dir, os.path.basename(output_path)
+            ),
+        )
 
-            start_time = time.monotonic()
+        # Step 2: Generate Thumbnail from the first video frame
+        thumbnail_path = generate_thumbnail(downloaded_video_path or "")
+        if not thumbnail_path:
+            return None
 
-            operation: types.GenerateVideosOperation = (
-                client.models.generate_videos(
-                    model=request_dto.generation_model,
-                    prompt=request_dto.prompt,
-                    image=start_image_for_api,
-                    video=source_video_for_api,
-                    config=types.GenerateVideosConfig(
-                        number_of_videos=request_dto.number_of_media,
-                        output_gcs_uri=gcs_output_directory,
-                        aspect_ratio=request_dto.aspect_ratio,
-                        negative_prompt=request_dto.negative_prompt,
-                        generate_audio=request_dto.generate_audio,
-                        # TODO: Pass from dto the secs if extending video (4, 5, 6, 7)
-                        duration_seconds=(
-                            request_dto.duration_seconds
-                            if not source_video_for_api
-                            else 7
-                        ),
-                        last_frame=end_image_for_api,
+        # Step 3: Save the Thumbnail in GCS, next to its video
+        try:
+            return (
+                gcs_service.upload_file_to_gcs(
+                    local_path=thumbnail_path,
+                    destination_blob_name=posixpath.join(
+                        posixpath.dirname(output_path),
+                        os.path.basename(thumbnail_path),
                     ),
+                    mime_type="image/png",
                 )
+                or ""
             )
+        except Exception as e:
+            logger.error("Failed to upload %s. Error: %s", thumbnail_path, e)
+            return None
+    finally:
+        # Only this video's scratch directory is removed.
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
-            # Poll the operation status until the video is ready
-            while not operation.done:
-                worker_logger.info(
-                    "Waiting for video generation to complete, polling video generation status...",
-                    extra={
-                        "json_fields": {
-                            "media_id": media_item_id,
-                            "operation_name": operation.name,
-                        }
-                    },
-                )
-                time.sleep(10)
-                operation = client.operations.get(operation)
 
-            if operation.error:
-                raise Exception(operation.error)
+async def _run_video_generation_job(
+    media_item_id: str, request_dto: CreateVeoDto, worker_logger: logging.Logger
+):
+    """
+    Generates the videos for a placeholder MediaItem, stores their thumbnails
+    and updates the document with the final result or the error.
+    """
+    # Create new instances of dependencies within this process
+    media_repo = MediaRepository()
+    gemini_service = GeminiService()
+    gcs_service = GcsService()
+    source_asset_repo = SourceAssetRepository()
+    try:
+        client = GenAIModelSetup.init()
+        cfg = config_service
+        gcs_output_directory = f"gs://{cfg.GENMEDIA_BUCKET}"
 
-            if (
-                not operation
-                or not operation.response
-                or not operation.response.generated_videos
-            ):
+        async def get_source_asset(asset_id: Optional[str]):
+            if not asset_id:
                 return None
+            return await asyncio.to_thread(source_asset_repo.get_by_id, asset_id)
+
+        async def get_media_item(gen_input: SourceMediaItemLink):
+            return await asyncio.to_thread(
+                media_repo.get_by_id, gen_input.media_item_id
+            )
 
-            # Download the generated video and create thumbnail
-            thumbnail_path = ""
+        # The prompt rewrite and every source lookup are independent reads,
+        # so they are issued together.
+        (
+            rewritten_prompt,
+            video_asset,
+            start_asset,
+            end_asset,
+            *parent_items,
+        ) = await asyncio.gather(
+            asyncio.to_thread(
+                gemini_service.enhance_prompt_from_dto,
+                dto=request_dto,
+                target_type=PromptTargetEnum.VIDEO,
+            ),
+            get_source_asset(request_dto.source_video_asset_id),
+            get_source_asset(request_dto.start_image_asset_id),
+            get_source_asset(request_dto.end_image_asset_id),
+            *(
+                get_media_item(gen_input)
+                for gen_input in request_dto.source_media_items or []
+            ),
+        )
+        request_dto.prompt = rewritten_prompt
 
-            final_source_media_items = request_dto.source_media_items
-            permanent_thumbnail_gcs_uris = []
+        # --- Handle Source Assets for API Call ---
+        start_image_for_api: Optional[types.Image] = None
+        end_image_for_api: Optional[types.Image] = None
+        original_source_video_item_link: Optional[SourceMediaItemLink] = None
+        # --- Handle Video Extension ---
+        source_video_for_api: Optional[types.Video] = None
 
-            for generated_video in operation.response.generated_videos:
-                if generated_video.video and generated_video.video.uri:
-                    output_path = f"{generated_video.video.uri.replace(f"gs://{cfg.GENMEDIA_BUCKET}/", "")}"
+        if request_dto.source_video_asset_id:
+            if video_asset:
+                source_video_for_api = types.Video(uri=video_asset.gcs_uri)
+            else:
+                worker_logger.warning(
+                    f"Could not find source video asset: {request_dto.source_video_asset_id}"
+                )
+        if start_asset:
+            start_image_for_api = types.Image(
+                gcs_uri=start_asset.gcs_uri, mime_type=start_asset.mime_type
+            )
+        if end_asset:
+            end_image_for_api = types.Image(
+                gcs_uri=end_asset.gcs_uri, mime_type=end_asset.mime_type
+            )
 
-                    # Step 1: Download the Video from GCS
-                    local_output_path = f"thumbnails/{output_path}"
-                    downloaded_video_path = gcs_service.download_from_gcs(
-                        gcs_uri_path=output_path,
-                        destination_file_path=local_output_path,
-                    )
+        # --- Handle Generated Inputs (from other MediaItems) ---
+        for gen_input, parent_item in zip(
+            request_dto.source_media_items or [], parent_items
+        ):
+            if (
+                parent_item
+                and parent_item.gcs_uris
+                and 0 <= gen_input.media_index < len(parent_item.gcs_uris)
+            ):
+                gcs_uri = parent_item.gcs_uris[gen_input.media_index]
+                image_for_api = types.Image(
+                    gcs_uri=gcs_uri, mime_type=parent_item.mime_type
+                )
 
-                    # Step 2: Generate Thumbnail from the first video frame
-                    thumbnail_path = generate_thumbnail(
-                        downloaded_video_path or ""
-                    )
+                if gen_input.role == AssetRoleEnum.START_FRAME:
+                    start_image_for_api = image_for_api
+                elif gen_input.role == AssetRoleEnum.END_FRAME:
+                    end_image_for_api = image_for_api
+                elif gen_input.role == AssetRoleEnum.VIDEO_EXTENSION_SOURCE:
+                    original_source_video_item_link = gen_input
+                    source_video_for_api = types.Video(uri=gcs_uri)
+            else:
+                worker_logger.warning(
+                    f"Could not find or use generated_input: {gen_input.media_item_id} at index {gen_input.media_index}"
+                )
 
-                    # Step 3: Save the Thumbnail in GCS
-                    if thumbnail_path:
-                        # Get the parent directory of the thumbnail to clean it up later.
-                        temp_dir = os.path.dirname(thumbnail_path)
-                        try:
-                            thumbnail_gcs_uri = (
-                                gcs_service.upload_file_to_gcs(
-                                    local_path=thumbnail_path,
-                                    destination_blob_name=thumbnail_path.replace(
-                                        "thumbnails/", ""
-                                    ),
-                                    mime_type="image/png",
-                                )
-                                or ""
-                            )
-                            permanent_thumbnail_gcs_uris.append(
-                                thumbnail_gcs_uri
-                            )
-                            # TODO: Delete the folder created under thumbnails/
-                        except Exception as e:
-                            # It's good practice to log or handle potential upload errors.
-                            print(
-                                f"Failed to upload {thumbnail_path}. Error: {e}"
-                            )
-                        finally:
-                            # This block executes whether the try block succeeded or failed.
-                            # We use shutil.rmtree to recursively delete the temporary directory.
-                            if os.path.exists(temp_dir):
-                                shutil.rmtree(temp_dir)
-
-            all_generated_videos.extend(
-                operation.response.generated_videos or []
-            )
+        all_generated_videos: List[types.GeneratedVideo] = []
 
-            end_time = time.monotonic()
-            generation_time = end_time - start_time
-
-            valid_generated_videos = [
-                img
-                for img in all_generated_videos
-                if img.video and img.video.uri
-            ]
-            permanent_gcs_uris = [
-                img.video.uri
-                for img in valid_generated_videos
-                if img.video and img.video.uri
-            ]
-
-            # --- WHEN COMPLETE, UPDATE THE DOCUMENT IN FIRESTORE ---
-            update_data = {
-                "status": JobStatusEnum.COMPLETED,
-                "prompt": rewritten_prompt,
-                "gcs_uris": permanent_gcs_uris,  # The final GCS URLs
-                "thumbnail_uris": permanent_thumbnail_gcs_uris,
-                "generation_time": generation_time,
-                "num_media": len(permanent_gcs_uris),
-                "source_media_items": (
-                    [item.model_dump() for item in final_source_media_items]
-                    if final_source_media_items
-                    else None
+        start_time = time.monotonic()
+
+        operation: types.GenerateVideosOperation = await asyncio.to_thread(
+            client.models.generate_videos,
+            model=request_dto.generation_model,
+            prompt=request_dto.prompt,
+            image=start_image_for_api,
+            video=source_video_for_api,
+            config=types.GenerateVideosConfig(
+                number_of_videos=request_dto.number_of_media,
+                output_gcs_uri=gcs_output_directory,
+                aspect_ratio=request_dto.aspect_ratio,
+                negative_prompt=request_dto.negative_prompt,
+                generate_audio=request_dto.generate_audio,
+                # TODO: Pass from dto the secs if extending video (4, 5, 6, 7)
+                duration_seconds=(
+                    request_dto.duration_seconds
+                    if not source_video_for_api
+                    else 7
                 ),
-            }
-            media_repo.update(media_item_id, update_data)
+                last_frame=end_image_for_api,
+            ),
+        )
+
+        # Poll the operation status until the video is ready
+        while not operation.done:
             worker_logger.info(
-                "Successfully processed video job.",
+                "Waiting for video generation to complete, polling video generation status...",
                 extra={
                     "json_fields": {
                         "media_id": media_item_id,
-                        "generation_time_seconds": generation_time,
-                        "videos_generated": len(permanent_gcs_uris),
+                        "operation_name": operation.name,
                     }
                 },
             )
+            await asyncio.sleep(10)
+            operation = await asyncio.to_thread(client.operations.get, operation)
+
+        if operation.error:
+            raise Exception(operation.error)
+
+        if (
+            not operation
+            or not operation.response
+            or not operation.response.generated_videos
+        ):
+            return None
+
+        # Download the generated videos and create their thumbnails concurrently
+        final_source_media_items = request_dto.source_media_items
+        thumbnail_results = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    _store_video_thumbnail,
+                    gcs_service,
+                    generated_video.video.uri,
+                    cfg.GENMEDIA_BUCKET,
+                )
+                for generated_video in operation.response.generated_videos
+                if generated_video.video and generated_video.video.uri
+            )
+        )
+        permanent_thumbnail_gcs_uris = [
+            uri for uri in thumbnail_results if uri is not None
+        ]
+
+        all_generated_videos.extend(operation.response.generated_videos or [])
+
+        end_time = time.monotonic()
+        generation_time = end_time - start_time
+
+        valid_generated_videos = [
+            img for img in all_generated_videos if img.video and img.video.uri
+        ]
+        permanent_gcs_uris = [
+            img.video.uri
+            for img in valid_generated_videos
+            if img.video and img.video.uri
+        ]
+
+        # --- WHEN COMPLETE, UPDATE THE DOCUMENT IN FIRESTORE ---
+        update_data = {
+            "status": JobStatusEnum.COMPLETED,
+            "prompt": rewritten_prompt,
+            "gcs_uris": permanent_gcs_uris,  # The final GCS URLs
+            "thumbnail_uris": permanent_thumbnail_gcs_uris,
+            "generation_time": generation_time,
+            "num_media": len(permanent_gcs_uris),
+            "source_media_items": (
+                [item.model_dump() for item in final_source_media_items]
+                if final_source_media_items
+                else None
+            ),
+        }
+        await asyncio.to_thread(media_repo.update, media_item_id, update_data)
+        worker_logger.info(
+            "Successfully processed video job.",
+            extra={
+                "json_fields": {
+                    "media_id": media_item_id,
+                    "generation_time_seconds": generation_time,
+                    "videos_generated": len(permanent_gcs_uris),
+                }
+            },
+        )
 
-        except Exception as e:
-            worker_logger.error(
-                "Video generation task failed.",
-                extra={
-                    "json_fields": {"media_id": media_item_id, "error": str(e)}
-                },
-                exc_info=True,
-            )  # exc_info=True still adds the full traceback
-            # --- ON FAILURE, UPDATE THE DOCUMENT WITH AN ERROR STATUS ---
-            error_update_data = {
-                "status": JobStatusEnum.FAILED,
-                "error_message": str(e),
-            }
-            media_repo.update(media_item_id, error_update_data)
     except Exception as e:
         worker_logger.error(
             "Video generation task failed.",
             extra={"json_fields": {"media_id": media_item_id, "error": str(e)}},
             exc_info=True,
         )  # exc_info=True still adds the full traceback
+        # --- ON FAILURE, UPDATE THE DOCUMENT WITH AN ERROR STATUS ---
+        error_update_data = {
+            "status": JobStatusEnum.FAILED,
+            "error_message": str(e),
+        }
+        await asyncio.to_thread(
+            media_repo.update, media_item_id, error_update_data
+        )
 
 
 def _process_video_concatenation_in_background(
@@ -409,8 +472,8 @@ def _process_video_concatenation_in_background(
                     continue
 
                 local_path = gcs_service.download_from_gcs(
-                    gcs_uri_path=gcs_uri.replace(
-                        f"gs://{cfg.GENMEDIA_BUCKET}/", ""
+                    gcs_uri_path=gcs_uri.removeprefix(
+                        f"gs://{cfg.GENMEDIA_BUCKET}/"
                     ),
                     destination_file_path=f"{temp_dir}/{video_input.id}.mp4",
                 )
@@ -558,12 +621,15 @@ class VeoService:
 
         # 4. Instead of using Fastapi's BackgroundTasks, submit the long-running
         # function to the process pool, running it in a completely separate process.
-        executor.submit(
+        future = executor.submit(
             _process_video_in_background,
             media_item_id=placeholder_item.id,
             request_dto=request_dto,
             current_user=user,
         )
+        future.add_done_callback(
+            partial(_log_background_job_failure, placeholder_item.id)
+        )
 
         logger.info(
             "Video generation job successfully queued.",
@@ -580,7 +646,7 @@ class VeoService:
 
         # 5. Return the placeholder to the frontend
         return MediaItemResponse(
-            **placeholder_item.model_dump(),
+            **placeholder_item.__dict__,
             presigned_urls=[],
             presigned_thumbnail_urls=[],
         )
@@ -626,7 +692,7 @@ class VeoService:
         # 4. Construct the final response DTO.
         # We unpack the original model's data and add the new URL lists.
         return MediaItemResponse(
-            **media_item.model_dump(),
+            **media_item.__dict__,
             presigned_urls=presigned_urls,
             presigned_thumbnail_urls=presigned_thumbnail_urls,
         )
@@ -679,16 +745,19 @@ class VeoService:
 
         self.media_repo.save(placeholder_item)
 
-        executor.submit(
+        future = executor.submit(
             _process_video_concatenation_in_background,
             media_item_id=placeholder_item.id,
             request_dto=request_dto,
         )
+        future.add_done_callback(
+            partial(_log_background_job_failure, placeholder_item.id)
+        )
 
         logger.info(f"Video concatenation job queued: {placeholder_item.id}")
 
         return MediaItemResponse(
-            **placeholder_item.model_dump(),
+            **placeholder_item.__dict__,
             presigned_urls=[],
             presigned_thumbnail_urls=[],
         )
@@ -2,8 +2,8 @@ from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from src.auth.auth_guard import RoleChecker, get_current_user
-from src.users.user_model import UserModel, UserRoleEnum
+from src.auth.auth_guard import get_current_user
+from src.users.user_model import UserModel
 from src.workspaces.dto.create_workspace_dto import CreateWorkspaceDto
 from src.workspaces.dto.invite_user_dto import InviteUserDto
 from src.workspaces.schema.workspace_model import WorkspaceModel
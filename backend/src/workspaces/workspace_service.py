@@ -2,7 +2,6 @@ from typing import List, Optional
 
 from fastapi import HTTPException, status
 from google.cloud.firestore_v1.base_query import FieldFilter
-from google.cloud.firestore_v1.field_path import FieldPath
 
 from src.common.email_service import EmailService
 from src.users.repository.user_repository import UserRepository
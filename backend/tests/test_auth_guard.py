@@ -0,0 +1,112 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the per-token user cache in the auth guard."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.auth import auth_guard
+from src.users.user_model import UserModel, UserRoleEnum
+
+NOW = 1_000_000.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [NOW]
+    monkeypatch.setattr(auth_guard.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def user():
+    return UserModel(
+        email="user@example.com", roles=[UserRoleEnum.USER], name="User", picture=""
+    )
+
+
+@pytest.fixture
+def auth(monkeypatch, clock, user):
+    """Patches token verification and provisioning, starting from an empty cache."""
+    monkeypatch.setattr(auth_guard, "_user_cache", auth_guard.OrderedDict())
+    monkeypatch.setattr(auth_guard.config_service, "ALLOWED_ORGS_STR", "")
+    monkeypatch.setattr(auth_guard.config_service, "AUTH_USER_CACHE_TTL_SECONDS", 60)
+    monkeypatch.setattr(auth_guard.config_service, "AUTH_USER_CACHE_MAX_ENTRIES", 10)
+    verify = MagicMock(return_value={"email": user.email, "exp": NOW + 3600})
+    monkeypatch.setattr(auth_guard.id_token, "verify_oauth2_token", verify)
+    monkeypatch.setattr(
+        auth_guard.user_service,
+        "create_user_if_not_exists",
+        MagicMock(return_value=user),
+    )
+    return verify
+
+
+def test_cache_hit_skips_token_verification(auth, user):
+    assert auth_guard.get_current_user("token") is user
+    assert auth_guard.get_current_user("token") is user
+    auth.assert_called_once()
+
+
+def test_raw_tokens_are_not_kept_in_the_cache(auth):
+    auth_guard.get_current_user("token")
+
+    assert "token" not in auth_guard._user_cache
+    assert list(auth_guard._user_cache) == [auth_guard._token_key("token")]
+
+
+def test_entry_expires_with_the_ttl(auth, clock):
+    auth_guard.get_current_user("token")
+
+    clock[0] += 61
+    auth_guard.get_current_user("token")
+    assert auth.call_count == 2
+
+
+def test_entry_expires_with_the_token_before_the_ttl(auth, clock, user):
+    auth.return_value = {"email": user.email, "exp": NOW + 5}
+    auth_guard.get_current_user("token")
+
+    clock[0] += 4
+    auth_guard.get_current_user("token")
+    assert auth.call_count == 1
+
+    clock[0] += 2
+    auth_guard.get_current_user("token")
+    assert auth.call_count == 2
+
+
+def test_least_recently_used_token_is_evicted(auth, monkeypatch):
+    monkeypatch.setattr(auth_guard.config_service, "AUTH_USER_CACHE_MAX_ENTRIES", 2)
+    auth_guard.get_current_user("a")
+    auth_guard.get_current_user("b")
+    auth_guard.get_current_user("a")
+    auth_guard.get_current_user("c")
+    assert auth.call_count == 3
+
+    auth_guard.get_current_user("a")
+    assert auth.call_count == 3
+    auth_guard.get_current_user("b")
+    assert auth.call_count == 4
+
+
+def test_zero_max_entries_disables_the_cache(auth, monkeypatch):
+    monkeypatch.setattr(auth_guard.config_service, "AUTH_USER_CACHE_MAX_ENTRIES", 0)
+    auth_guard.get_current_user("token")
+    auth_guard.get_current_user("token")
+
+    assert auth.call_count == 2
+    assert not auth_guard._user_cache
@@ -0,0 +1,114 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the in-process Gemini response cache."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+from src.multimodal.gemini_cache import GeminiResponseCache
+
+
+def test_get_or_compute_calls_fetch_only_on_miss():
+    cache = GeminiResponseCache(max_entries=10, ttl_seconds=60)
+    fetch = MagicMock(return_value="rewritten")
+    key = cache.make_key("model", "application/json", "Schema", "prompt")
+
+    assert cache.get_or_compute(key, fetch) == "rewritten"
+    assert cache.get_or_compute(key, fetch) == "rewritten"
+    fetch.assert_called_once()
+
+
+def test_empty_responses_are_not_cached():
+    cache = GeminiResponseCache(max_entries=10, ttl_seconds=60)
+    fetch = MagicMock(return_value="")
+
+    cache.get_or_compute("key", fetch)
+    cache.get_or_compute("key", fetch)
+    assert fetch.call_count == 2
+
+
+def test_expired_entries_are_refetched():
+    cache = GeminiResponseCache(max_entries=10, ttl_seconds=0)
+    fetch = MagicMock(side_effect=["first", "second"])
+
+    assert cache.get_or_compute("key", fetch) == "first"
+    assert cache.get_or_compute("key", fetch) == "second"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = GeminiResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+
+def test_aget_or_compute_awaits_fetch_only_on_miss():
+    cache = GeminiResponseCache(max_entries=10, ttl_seconds=60)
+    fetch = AsyncMock(return_value="rewritten")
+
+    async def run():
+        first = await cache.aget_or_compute("key", fetch)
+        second = await cache.aget_or_compute("key", fetch)
+        return first, second
+
+    assert asyncio.run(run()) == ("rewritten", "rewritten")
+    fetch.assert_awaited_once()
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = GeminiResponseCache(max_entries=10, ttl_seconds=60)
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "rewritten"
+
+    async def run():
+        return await asyncio.gather(
+            *(cache.aget_or_compute("key", fetch) for _ in range(5))
+        )
+
+    assert asyncio.run(run()) == ["rewritten"] * 5
+    assert calls == 1
+
+
+def test_concurrent_sync_misses_share_one_fetch():
+    cache = GeminiResponseCache(max_entries=10, ttl_seconds=60)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_fetch():
+        started.set()
+        release.wait()
+        return "ok"
+
+    fetch = MagicMock(side_effect=slow_fetch)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(cache.get_or_compute, "key", fetch)
+        started.wait()
+        follower = pool.submit(cache.get_or_compute, "key", fetch)
+        release.set()
+        assert leader.result() == follower.result() == "ok"
+    fetch.assert_called_once()
@@ -0,0 +1,46 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the GeminiService prompt template selection."""
+
+import pytest
+
+from src.multimodal.gemini_service import GeminiService, PromptTargetEnum
+from src.multimodal.rewriters import (
+    RANDOM_IMAGE_PROMPT_TEMPLATE,
+    RANDOM_VIDEO_PROMPT_TEMPLATE,
+    REWRITE_IMAGE_TEXT_PROMPT_TEMPLATE,
+    REWRITE_VIDEO_TEXT_PROMPT_TEMPLATE,
+)
+
+
+@pytest.mark.parametrize(
+    "target_type, original_prompt, expected_template",
+    [
+        (PromptTargetEnum.IMAGE, "", RANDOM_IMAGE_PROMPT_TEMPLATE),
+        (PromptTargetEnum.VIDEO, "", RANDOM_VIDEO_PROMPT_TEMPLATE),
+        (PromptTargetEnum.IMAGE, "a cat", REWRITE_IMAGE_TEXT_PROMPT_TEMPLATE),
+        (PromptTargetEnum.VIDEO, "a cat", REWRITE_VIDEO_TEXT_PROMPT_TEMPLATE),
+    ],
+)
+def test_random_or_rewrite_template_matches_target(
+    target_type, original_prompt, expected_template
+):
+    # The template choice doesn't touch any clients, so skip __init__.
+    service = GeminiService.__new__(GeminiService)
+
+    template = service._get_random_or_rewrite_template(
+        target_type, original_prompt
+    )
+    assert template is expected_template
@@ -0,0 +1,33 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the Gemini request token bucket."""
+
+from src.multimodal.rate_limiter import TokenBucket
+
+
+def test_burst_is_free_then_calls_are_spaced_by_rate():
+    bucket = TokenBucket(rate_per_second=10, burst=2)
+
+    assert bucket._reserve() == 0
+    assert bucket._reserve() == 0
+    # The next two tokens are due 0.1s and 0.2s from now.
+    assert 0.05 < bucket._reserve() <= 0.1
+    assert 0.15 < bucket._reserve() <= 0.2
+
+
+def test_zero_rate_disables_the_limit():
+    bucket = TokenBucket(rate_per_second=0, burst=1)
+
+    assert all(bucket._reserve() == 0 for _ in range(100))